@@ -0,0 +1,99 @@
+# analytics.py - Vectorized Metric Analytics
+# Works on the WeighIn history as one columnar NumPy array (one column per BeWell metric), so
+# every trend statistic for all 10 metrics comes out of a handful of array operations instead of
+# a Python loop with a getattr per row and column.
+
+from itertools import chain
+
+import numpy as np
+
+# The 10 BeWell metrics, in column order, with their display label and unit
+METRIC_MAP = {
+    'weight_lbs': {'label': 'Weight', 'unit': 'lbs'},
+    'fat_pct': {'label': 'Body Fat', 'unit': '%'},
+    'bmi': {'label': 'BMI', 'unit': ''},
+    'bmr_kcal': {'label': 'BMR', 'unit': 'kcal/day'},
+    'visceral_fat': {'label': 'Visceral Fat', 'unit': ''},
+    'muscle_lbs': {'label': 'Muscle', 'unit': 'lbs'},
+    'bone_mass_lbs': {'label': 'Bone Mass', 'unit': 'lbs'},
+    'protein_pct': {'label': 'Protein', 'unit': '%'},
+    'water_pct': {'label': 'Water', 'unit': '%'},
+    'skeletal_muscle_lbs': {'label': 'Skeletal Muscle', 'unit': 'lbs'},
+}
+METRIC_COLUMNS = tuple(METRIC_MAP)
+
+ROLLING_WINDOWS = (7, 30)   # days
+EMA_SPAN = 10               # weigh-ins
+EMA_TOLERANCE = 1e-12       # weights below this share of the newest one are ignored
+
+def metric_columns_from_rows(rows):
+    """
+    Converts (date_logged, weight_lbs, ..., skeletal_muscle_lbs) rows, oldest first, into
+    (days, values): day ordinals as an int64 vector and the metrics as an (n, 10) float matrix.
+    """
+    rows = list(rows)
+    days = np.fromiter((row[0].toordinal() for row in rows), dtype=np.int64, count=len(rows))
+    values = np.fromiter(chain.from_iterable(row[1:] for row in rows), dtype=np.float64,
+                         count=len(rows) * len(METRIC_COLUMNS)).reshape(len(rows), len(METRIC_COLUMNS))
+    return days, values
+
+def latest_rolling_mean(days, values, window_days):
+    """Mean of every metric over the `window_days` calendar days ending at the newest weigh-in."""
+    window_start = np.searchsorted(days, days[-1] - (window_days - 1), side='left')
+    return values[window_start:].mean(axis=0)
+
+def latest_ema(values, span=EMA_SPAN):
+    """
+    Exponential moving average of every metric at the newest weigh-in. Only the tail whose
+    weights still matter is used, so the cost doesn't grow with the history length.
+    """
+    alpha = 2 / (span + 1)
+    tail = min(len(values), int(np.ceil(np.log(EMA_TOLERANCE) / np.log(1 - alpha))) + 1)
+    weights = (1 - alpha) ** np.arange(tail - 1, -1, -1)
+    return weights @ values[-tail:] / weights.sum()
+
+def slopes_per_week(days, values):
+    """Least-squares slope of every metric against time, in units per week."""
+    x = days - days.mean()
+    denominator = (x * x).sum()
+    if denominator == 0:
+        # All weigh-ins on the same day: no time span to fit a slope over
+        return np.zeros(values.shape[1])
+    return 7 * (x @ (values - values.mean(axis=0))) / denominator
+
+def compute_metric_trends(days, values):
+    """
+    Computes the trend summary for all 10 metrics from columnar weigh-in data sorted oldest
+    first: first/last change plus rolling 7/30-day means, EMA-smoothed value, least-squares
+    slope per week and min/max. Returns {} with fewer than two weigh-ins.
+    """
+    if len(days) < 2:
+        return {}
+
+    oldest = values[0]
+    latest = values[-1]
+    change = latest - oldest
+    rolling = {window: latest_rolling_mean(days, values, window) for window in ROLLING_WINDOWS}
+    ema = latest_ema(values)
+    slopes = slopes_per_week(days, values)
+    minimums = values.min(axis=0)
+    maximums = values.max(axis=0)
+
+    trend_summary = {}
+    for index, (col, info) in enumerate(METRIC_MAP.items()):
+        trend_summary[col] = {
+            'label': info['label'],
+            'unit': info['unit'],
+            'latest_value': float(latest[index]),
+            'oldest_value': float(oldest[index]),
+            'change': float(change[index]),
+            'trend': 'Gain' if change[index] > 0 else 'Loss' if change[index] < 0 else 'No Change',
+            'rolling_7': float(rolling[7][index]),
+            'rolling_30': float(rolling[30][index]),
+            'ema': float(ema[index]),
+            'slope_per_week': float(slopes[index]),
+            'min': float(minimums[index]),
+            'max': float(maximums[index]),
+        }
+
+    return trend_summary
@@ -0,0 +1,2 @@
+# benchmarks - Performance Benchmarks for the Diet Tracker
+# Run a benchmark module from the project root, e.g. `python -m benchmarks.food_search`.
@@ -0,0 +1,103 @@
+# benchmarks/datagen.py - Synthetic Data Generator
+# Fills the app's database with realistic-looking history: a food dictionary plus, for each of a
+# number of users, years of daily food logs, activities and weigh-ins. Rows are written with
+# executemany in large batches (one user at a time, so memory stays flat however many users are
+# generated) and the daily rollup is rebuilt at the end, exactly as after a bulk import.
+
+import random
+from datetime import date, timedelta
+
+from benchmarks.food_search import make_dictionary
+
+INSERT_BATCH = 10_000
+
+# Every generated user is named user<N> and logs in with this password
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+ACTIVITY_TYPES = ('Walk', 'Run', 'Bike', 'Resistance Training', 'Swim', 'Yoga', 'Hike')
+
+def daily_dates(years, end=None):
+    """Returns every date of the last `years` years, oldest first."""
+    end = end or date.today()
+    start = end - timedelta(days=int(365.25 * years) - 1)
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+def _insert(table, rows, session):
+    for start in range(0, len(rows), INSERT_BATCH):
+        session.execute(table.insert(), rows[start:start + INSERT_BATCH])
+
+def populate(years, users=1, food_items=500, foods_per_day=5, activities_per_day=1, weighins_per_week=3, seed=10):
+    """
+    Recreates all tables and fills them with `years` of daily logs for each of `users` users
+    (ids 1..users). Must run inside an app context. Returns a dict with the row counts that
+    were generated.
+    """
+    # Imported here so DATABASE_URL can be set before the app module is first imported
+    from werkzeug.security import generate_password_hash
+    from app import (ActivityEntry, FoodEntry, FoodItem, User, WeighIn, db, food_cache,
+                     rebuild_daily_rollups)
+
+    rng = random.Random(seed)
+    db.drop_all()
+    db.create_all()
+    food_cache.invalidate()
+
+    dictionary = make_dictionary(food_items, rng)
+    _insert(FoodItem.__table__, [item._asdict() for item in dictionary], db.session)
+
+    # Password hashing is deliberately slow, so every user shares one hash
+    password_hash = generate_password_hash(BENCHMARK_PASSWORD)
+    # The first account is the admin, as in create_user
+    _insert(User.__table__, [{'id': user_id, 'username': f'user{user_id}', 'password_hash': password_hash,
+                              'is_admin': user_id == 1}
+                             for user_id in range(1, users + 1)], db.session)
+
+    counts = {'years': years, 'users': users, 'food_items': len(dictionary),
+              'food_entries': 0, 'activity_entries': 0, 'weighins': 0}
+    for user_id in range(1, users + 1):
+        food_rows, activity_rows, weighin_rows = generate_user_history(
+            user_id, years, dictionary, rng, foods_per_day, activities_per_day, weighins_per_week)
+        _insert(FoodEntry.__table__, food_rows, db.session)
+        _insert(ActivityEntry.__table__, activity_rows, db.session)
+        _insert(WeighIn.__table__, weighin_rows, db.session)
+        counts['food_entries'] += len(food_rows)
+        counts['activity_entries'] += len(activity_rows)
+        counts['weighins'] += len(weighin_rows)
+
+    db.session.commit()
+    rebuild_daily_rollups()
+    return counts
+
+def generate_user_history(user_id, years, dictionary, rng, foods_per_day, activities_per_day, weighins_per_week):
+    """Returns (food rows, activity rows, weigh-in rows) covering `years` of one user's logs."""
+    food_rows, activity_rows, weighin_rows = [], [], []
+    weight = rng.uniform(180, 300)
+    for day in daily_dates(years):
+        for _ in range(rng.randint(max(foods_per_day - 2, 1), foods_per_day + 2)):
+            item = rng.choice(dictionary)
+            multiplier = rng.choice((0.5, 1.0, 1.0, 1.5, 2.0))
+            food_rows.append({
+                'user_id': user_id, 'food_item_id': item.id, 'food_name': item.name, 'serving_multiplier': multiplier,
+                'calories': int(item.calories * multiplier), 'protein': item.protein * multiplier,
+                'carbs': item.carbs * multiplier, 'fat': item.fat * multiplier,
+                'notes': '', 'date_eaten': day,
+            })
+
+        for _ in range(activities_per_day):
+            if rng.random() < 0.8:
+                activity_rows.append({
+                    'user_id': user_id, 'activity_type': rng.choice(ACTIVITY_TYPES), 'duration_minutes': rng.uniform(15, 90),
+                    'calories_burned': rng.randint(80, 700), 'distance_miles': rng.uniform(0, 6),
+                    'notes': '', 'date_logged': day,
+                })
+
+        if rng.random() < weighins_per_week / 7:
+            weight = max(150.0, weight + rng.gauss(-0.05, 0.6))
+            weighin_rows.append({
+                'user_id': user_id, 'date_logged': day, 'weight_lbs': weight, 'fat_pct': rng.uniform(25, 38),
+                'bmi': weight / 7.1, 'bmr_kcal': 1500 + weight * 2.5, 'visceral_fat': rng.uniform(10, 20),
+                'muscle_lbs': weight * 0.6, 'bone_mass_lbs': weight * 0.025, 'protein_pct': rng.uniform(12, 18),
+                'water_pct': rng.uniform(45, 55), 'skeletal_muscle_lbs': weight * 0.34,
+            })
+
+    return food_rows, activity_rows, weighin_rows
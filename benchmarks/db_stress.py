@@ -0,0 +1,142 @@
+# benchmarks/db_stress.py - Concurrent Write/Read Stress Test
+# Runs writer threads (each logging food entries for its own user) alongside reader threads
+# (each loading an uncached /summary) against a fresh SQLite file, once with SQLite's stock
+# settings (rollback journal, synchronous=FULL) and once with the tuned PRAGMAs from db_config.py
+# (WAL, synchronous=NORMAL, larger cache, mmap), and prints the throughput of both:
+#
+#   python -m benchmarks.db_stress --writers 4 --readers 4 --duration 10
+#
+# Every profile runs in its own process, because the PRAGMAs are read when the app is imported.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.food_search import percentile
+
+# Environment overrides per profile; 'tuned' is the application's default configuration
+PROFILES = {
+    'default': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_CACHE_SIZE': '-2000',
+                'SQLITE_MMAP_SIZE': '0', 'SQLITE_TEMP_STORE': 'DEFAULT'},
+    'tuned': {},
+}
+
+def run_threads(app, writers, readers, duration):
+    """Runs the writer and reader threads for `duration` seconds and returns their results."""
+    from sqlalchemy.exc import OperationalError
+
+    results = {'write': [], 'read': [], 'errors': 0, 'locked': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    start = threading.Barrier(writers + readers)
+
+    def worker(kind, user_id):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['user_id'] = user_id
+            session['username'] = f'user{user_id}'
+        timings, errors, locked = [], 0, 0
+        start.wait()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if kind == 'write':
+                    response = client.post('/', data={'food_item_id': str(1 + len(timings) % 50),
+                                                      'serving_multiplier': '1', 'notes': 'stress'})
+                    ok = response.status_code == 302
+                else:
+                    response = client.get('/summary')
+                    ok = response.status_code == 200
+            except OperationalError as error:
+                ok = False
+                locked += 'locked' in str(error) or 'busy' in str(error)
+            if ok:
+                timings.append((time.perf_counter() - started) * 1000)
+            else:
+                errors += 1
+        with lock:
+            results[kind].extend(timings)
+            results['errors'] += errors
+            results['locked'] += locked
+
+    # Writers are users 1..writers, readers the users after them
+    threads = [threading.Thread(target=worker, args=('write', user_id)) for user_id in range(1, writers + 1)]
+    threads += [threading.Thread(target=worker, args=('read', writers + reader)) for reader in range(1, readers + 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results['write'].sort()
+    results['read'].sort()
+    return results
+
+def run_profile(options):
+    """Child process: seeds the database, runs the stress test and prints its results as JSON."""
+    from app import create_app, db
+    from benchmarks.datagen import populate
+    from db_config import describe_sqlite_settings
+
+    # Surface lock errors as exceptions instead of logged 500 pages
+    app = create_app({'PROPAGATE_EXCEPTIONS': True})
+    with app.app_context():
+        populate(options.years, users=options.writers + options.readers, food_items=50)
+        with db.engine.connect() as connection:
+            settings = describe_sqlite_settings(connection)
+        db.session.remove()
+
+    results = run_threads(app, options.writers, options.readers, options.duration)
+    print(json.dumps({
+        'settings': settings,
+        'writes_per_s': len(results['write']) / options.duration,
+        'reads_per_s': len(results['read']) / options.duration,
+        'write_p95_ms': percentile(results['write'], 95) if results['write'] else None,
+        'read_p95_ms': percentile(results['read'], 95) if results['read'] else None,
+        'errors': results['errors'],
+        'locked': results['locked'],
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare concurrent write/read throughput of SQLite settings.')
+    parser.add_argument('--writers', type=int, default=4, help='Threads logging food entries.')
+    parser.add_argument('--readers', type=int, default=4, help='Threads loading /summary.')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds each profile runs.')
+    parser.add_argument('--years', type=float, default=0.5, help='Years of history seeded per user.')
+    parser.add_argument('--profile', choices=PROFILES, help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.profile:
+        run_profile(options)
+        return
+
+    print(f"{options.writers} writer(s) and {options.readers} reader(s) for {options.duration:g}s per profile")
+    results = {}
+    for profile, overrides in PROFILES.items():
+        workdir = tempfile.mkdtemp(prefix='diet_tracker_stress_')
+        environ = dict(os.environ, **overrides,
+                       DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'stress.db')}",
+                       RESPONSE_CACHE_ENABLED='0')
+        child = subprocess.run([sys.executable, '-m', 'benchmarks.db_stress', '--profile', profile,
+                                '--writers', str(options.writers), '--readers', str(options.readers),
+                                '--duration', str(options.duration), '--years', str(options.years)],
+                               env=environ, capture_output=True, text=True)
+        if child.returncode != 0:
+            sys.exit(f"Profile '{profile}' failed:\n{child.stderr}")
+        results[profile] = result = json.loads(child.stdout.strip().splitlines()[-1])
+        settings = result['settings']
+        print(f"\n{profile}: journal_mode={settings['journal_mode']} synchronous={settings['synchronous']} "
+              f"cache_size={settings['cache_size']} mmap_size={settings['mmap_size']}")
+        print(f"  writes {result['writes_per_s']:8.1f}/s   p95 {result['write_p95_ms'] or 0:8.2f} ms")
+        print(f"  reads  {result['reads_per_s']:8.1f}/s   p95 {result['read_p95_ms'] or 0:8.2f} ms")
+        print(f"  failed requests {result['errors']} ({result['locked']} 'database is locked')")
+
+    default, tuned = results['default'], results['tuned']
+    print(f"\nThroughput gain: writes x{tuned['writes_per_s'] / max(default['writes_per_s'], 1e-9):.2f}, "
+          f"reads x{tuned['reads_per_s'] / max(default['reads_per_s'], 1e-9):.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/food_recompute.py - Web Latency While a Food Item Correction Is Propagated
+# Seeds synthetic history with a small food dictionary (so one item has thousands of
+# entries), then times a mix of page loads and food logs twice: on an idle app, and while the
+# background job started by editing that item rewrites its entries. Afterwards the daily rollup
+# is verified against the raw tables:
+#
+#   python -m benchmarks.food_recompute --years 20 --users 2
+#
+# Exits with status 1 if the job failed, left stale entries or broke the rollup.
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.food_search import percentile
+
+# (method, path, form) requests the logged-in user keeps making
+REQUEST_MIX = (
+    ('GET', '/', None),
+    ('GET', '/summary', None),
+    ('GET', '/history', None),
+    ('POST', '/', {'food_item_id': '2', 'serving_multiplier': '1', 'notes': 'bench'}),
+)
+
+def run_requests(client, response_cache, stop):
+    """Cycles through REQUEST_MIX until stop() is true; returns the timings (ms) per request."""
+    timings = {f'{method} {path}': [] for method, path, _ in REQUEST_MIX}
+    while not stop():
+        for method, path, form in REQUEST_MIX:
+            # Every request is measured uncached, as if a different page were loaded each time
+            response_cache.bump_version(1)
+            started = time.perf_counter()
+            response = client.post(path, data=form) if method == 'POST' else client.get(path)
+            timings[f'{method} {path}'].append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {path} returned {response.status_code}")
+    return timings
+
+def report(label, timings):
+    print(f"\n{label}")
+    for name, values in timings.items():
+        values.sort()
+        print(f"  {name:<12} {len(values):6} requests   p50 {percentile(values, 50):8.2f} ms   "
+              f"p95 {percentile(values, 95):8.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description='Time web requests while a FoodItem edit rewrites its entries.')
+    parser.add_argument('--years', type=float, default=20, help='Years of history per user.')
+    parser.add_argument('--users', type=int, default=2, help='Users logging the edited item.')
+    parser.add_argument('--food-items', type=int, default=10, help='Dictionary size (fewer = more entries per item).')
+    parser.add_argument('--idle-seconds', type=float, default=5, help='How long the idle baseline runs.')
+    options = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='diet_tracker_recompute_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'recompute.db')}"
+    from app import FoodEntry, FoodItem, FoodRecomputeJob, create_app, db, response_cache, verify_daily_rollups
+    from benchmarks.datagen import populate
+
+    app = create_app()
+
+    with app.app_context():
+        counts = populate(options.years, users=options.users, food_items=options.food_items)
+        entries = FoodEntry.query.filter_by(food_item_id=1).count()
+        db.session.remove()
+    print(f"{options.years:g} year(s) x {options.users} user(s): {counts['food_entries']:,} food entries, "
+          f"{entries:,} of them logged from item 1")
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+        session['username'] = 'user1'
+
+    # 1. Baseline with nothing running in the background
+    deadline = time.perf_counter() + options.idle_seconds
+    report('idle', run_requests(client, response_cache, lambda: time.perf_counter() > deadline))
+
+    # 2. Edit item 1 and keep requesting pages until its job finishes
+    progress = []
+    with app.app_context():
+        item = db.session.get(FoodItem, 1)
+        form = {'name': f'{item.name} (corrected)', 'calories': str(item.calories + 25), 'protein': str(item.protein),
+                'carbs': str(item.carbs), 'fat': str(item.fat + 1)}
+        db.session.remove()
+    started = time.perf_counter()
+    client.post('/manage_food/1/edit', data=form)
+    with app.app_context():
+        job_id = db.session.query(db.func.max(FoodRecomputeJob.id)).scalar()
+        db.session.remove()
+
+    def job_finished():
+        # Polled between request rounds, like the edit page does
+        job = client.get(f'/manage_food/jobs/{job_id}').get_json()
+        progress.append((time.perf_counter() - started, job['percent']))
+        return job['status'] in ('done', 'failed')
+
+    report('while the job runs', run_requests(client, response_cache, job_finished))
+    elapsed = time.perf_counter() - started
+
+    # 3. The job's result: every entry rewritten and the rollup still matching the raw tables
+    with app.app_context():
+        job = db.session.get(FoodRecomputeJob, job_id)
+        stale = FoodEntry.query.filter(FoodEntry.food_item_id == 1, FoodEntry.food_name != form['name']).count()
+        problems = verify_daily_rollups()
+        print(f"\njob {job.status}: {job.changed_entries:,}/{job.total_entries:,} entries in {elapsed:.2f}s "
+              f"({job.changed_entries / elapsed:,.0f} entries/s)")
+        print("  progress: " + ', '.join(f"{percent:g}% at {at:.1f}s" for at, percent in progress[::max(1, len(progress) // 8)]))
+        print(f"  stale entries {stale}, rollup mismatches {len(problems)}")
+        if job.status != 'done' or stale or problems:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
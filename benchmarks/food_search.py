@@ -0,0 +1,92 @@
+# benchmarks/food_search.py - Food Search Latency Benchmark
+# Builds FoodSearchIndex over synthetic dictionaries of increasing size and reports the
+# p50/p99 latency of autocomplete-style prefix queries.
+#
+#   python -m benchmarks.food_search [--sizes 10000 100000 1000000] [--queries 2000]
+
+import argparse
+import json
+import random
+import time
+
+from food_cache import FoodSnapshot
+from food_search import FoodSearchIndex
+
+WORDS = (
+    'chicken', 'breast', 'thigh', 'beef', 'ground', 'turkey', 'salmon', 'tuna', 'egg', 'white',
+    'rice', 'brown', 'oats', 'oatmeal', 'greek', 'yogurt', 'vanilla', 'chocolate', 'protein', 'shake',
+    'banana', 'apple', 'blueberry', 'strawberry', 'spinach', 'broccoli', 'potato', 'sweet', 'bread',
+    'whole', 'wheat', 'pasta', 'cheese', 'cheddar', 'milk', 'almond', 'peanut', 'butter', 'olive',
+    'oil', 'avocado', 'black', 'beans', 'chickpeas', 'lentils', 'tofu', 'bagel', 'pizza', 'burrito',
+    'salad', 'caesar', 'grilled', 'roasted', 'smoked', 'low', 'fat', 'sugar', 'free', 'organic',
+)
+
+def make_dictionary(size, rng):
+    """Returns `size` FoodSnapshots with unique names of two to four words plus a serving tag."""
+    return [
+        FoodSnapshot(item_id, ' '.join(rng.sample(WORDS, rng.randint(2, 4))) + f' #{item_id}',
+                     rng.randint(20, 900), rng.uniform(0, 60), rng.uniform(0, 90), rng.uniform(0, 40))
+        for item_id in range(1, size + 1)
+    ]
+
+def make_queries(count, rng):
+    """Returns what a user has typed so far: one or two words, the last one partial."""
+    queries = []
+    for _ in range(count):
+        words = rng.sample(WORDS, rng.randint(1, 2))
+        words[-1] = words[-1][:rng.randint(1, len(words[-1]))]
+        queries.append(' '.join(words))
+    return queries
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+def run(sizes, query_count, limit, seed):
+    rng = random.Random(seed)
+    queries = make_queries(query_count, rng)
+    results = []
+
+    for size in sizes:
+        items = make_dictionary(size, rng)
+
+        started = time.perf_counter()
+        index = FoodSearchIndex(items)
+        build_seconds = time.perf_counter() - started
+
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query, limit)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+
+        results.append({
+            'dictionary_size': size,
+            'build_seconds': round(build_seconds, 3),
+            'queries': len(queries),
+            'p50_ms': round(percentile(timings, 50), 4),
+            'p99_ms': round(percentile(timings, 99), 4),
+            'max_ms': round(timings[-1], 4),
+        })
+        print(f"{size:>9,} items: build {build_seconds:6.2f}s | "
+              f"p50 {results[-1]['p50_ms']:.3f} ms | p99 {results[-1]['p99_ms']:.3f} ms")
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Time autocomplete prefix queries on synthetic food dictionaries.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help='Dictionary sizes to index and query.')
+    parser.add_argument('--queries', type=int, default=2000, help='Prefix queries timed per dictionary.')
+    parser.add_argument('--limit', type=int, default=10, help='Matches returned per query, as in the food picker.')
+    parser.add_argument('--seed', type=int, default=8, help='Random seed for the dictionaries and queries.')
+    parser.add_argument('--json', metavar='PATH', help='Also write the results to a JSON file.')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.queries, args.limit, args.seed)
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(results, output, indent=2)
+
+if __name__ == '__main__':
+    main()
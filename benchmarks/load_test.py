@@ -0,0 +1,289 @@
+# benchmarks/load_test.py - Concurrent Load Test with Latency SLOs
+# Seeds a temporary database with one user per simulated logger, starts the app in its own
+# process behind a threaded HTTP server, and has a pool of client threads (each logged in as
+# its own user) hit the real routes over HTTP with a read/write mix for a fixed time:
+#
+#   python -m benchmarks.load_test --concurrency 8 --duration 30 --write-percent 30 --output load.json
+#
+# Prints (and optionally writes) a JSON report with the throughput, p50/p95/p99 latency and error
+# rate overall and per route, plus the SQLite lock failures the server saw. Exits with status 1 if
+# any SLO (--slo-p95-ms, --slo-p99-ms, --slo-error-rate, --slo-min-rps) is missed. --url points it
+# at a server that is already running instead (users user1..userN with the benchmark password);
+# lock failures can't be counted then.
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.food_search import percentile
+
+ERRORS_PATH = '/_load_test/errors'
+
+# (name, weight, method, path, form) picked at random by every simulated user; the form is
+# built per request so each write logs a fresh row
+READS = (
+    ('GET /', 25, 'GET', '/', None),
+    ('GET /log/activity', 5, 'GET', '/log/activity', None),
+    ('GET /log/metrics', 5, 'GET', '/log/metrics', None),
+    ('GET /summary', 35, 'GET', '/summary', None),
+    ('GET /history', 30, 'GET', '/history', None),
+)
+WRITES = (
+    ('POST /', 70, 'POST', '/', lambda rng: {'food_item_id': str(rng.randint(1, 50)),
+                                            'serving_multiplier': str(rng.choice((0.5, 1, 1.5, 2))),
+                                            'notes': 'load test'}),
+    ('POST /log/activity', 20, 'POST', '/log/activity',
+     lambda rng: {'activity_type': 'Walk', 'duration_minutes': str(rng.randint(10, 90)),
+                  'calories_burned': str(rng.randint(50, 600))}),
+    ('POST /log/metrics', 10, 'POST', '/log/metrics',
+     lambda rng: {'weight_lbs': f'{rng.uniform(180, 260):.1f}', 'bmr_kcal': str(rng.randint(1900, 2300))}),
+)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+# --- SERVER (child process) ---
+
+def serve(port):
+    """Child process: runs the app on a threaded WSGI server and counts the exceptions it raises."""
+    from flask import got_request_exception, jsonify
+    from werkzeug.serving import make_server
+
+    from app import create_app
+
+    app = create_app()
+    failures = {'sqlite_locked': 0, 'other_exceptions': 0}
+    lock = threading.Lock()
+
+    def count_exception(sender, exception, **extra):
+        locked = 'database is locked' in str(exception) or 'database is busy' in str(exception)
+        with lock:
+            failures['sqlite_locked' if locked else 'other_exceptions'] += 1
+
+    got_request_exception.connect(count_exception, app)
+    app.add_url_rule(ERRORS_PATH, 'load_test_errors', lambda: jsonify(failures))
+
+    # One access-log line per request would cost more than some of the requests
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+def start_server(environ, port, timeout=60):
+    """Starts the server child and waits until it answers; returns the Popen."""
+    child = subprocess.Popen([sys.executable, '-m', 'benchmarks.load_test', '--serve', '--port', str(port)],
+                             env=environ)
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if child.poll() is not None:
+            sys.exit("The server process exited before it was ready.")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/login')
+            connection.getresponse().read()
+            return child
+        except OSError:
+            time.sleep(0.1)
+    child.terminate()
+    sys.exit("The server didn't start in time.")
+
+# --- CLIENTS ---
+
+class Session:
+    """One simulated user: a session cookie and a new HTTP connection per request."""
+
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.cookie = None
+
+    def request(self, method, path, form=None):
+        """Sends one request; returns (status, elapsed ms). The body is read in full."""
+        headers = {'Cookie': self.cookie} if self.cookie else {}
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        started = time.perf_counter()
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        finally:
+            connection.close()
+        elapsed = (time.perf_counter() - started) * 1000
+
+        cookie = response.getheader('Set-Cookie')
+        if cookie and cookie.startswith('session='):
+            self.cookie = cookie.split(';', 1)[0]
+        return response.status, elapsed
+
+    def log_in(self, username, password):
+        status, _ = self.request('POST', '/login', {'username': username, 'password': password})
+        if status != 302 or not self.cookie:
+            raise RuntimeError(f"Logging in as {username} failed ({status}).")
+
+def run_user(base_url, user_id, password, options, deadline, warmup_until, seed):
+    """Requests pages as one user until the deadline; returns [(route, status, ms)] after the warm-up."""
+    rng = random.Random(seed)
+    session = Session(base_url, options.timeout)
+    session.log_in(f'user{user_id}', password)
+
+    reads = [route for route in READS for _ in range(route[1])]
+    writes = [route for route in WRITES for _ in range(route[1])]
+    results = []
+    while time.perf_counter() < deadline:
+        name, _, method, path, form = rng.choice(writes if rng.random() * 100 < options.write_percent else reads)
+        if path == '/history':
+            # A random month of history, like someone looking something up
+            start = date.today() - timedelta(days=rng.randint(0, int(options.years * 365)))
+            path = f"/history?start={start.isoformat()}&end={(start + timedelta(days=30)).isoformat()}"
+        try:
+            status, elapsed = session.request(method, path, form(rng) if form else None)
+        except OSError:
+            # Refused or timed out: counted as a failed request without a latency
+            status, elapsed = None, None
+        if time.perf_counter() >= warmup_until:
+            results.append((name, status, elapsed))
+        if options.think_ms:
+            time.sleep(rng.uniform(0, 2 * options.think_ms) / 1000)
+    return results
+
+# --- REPORT ---
+
+def ok(method, status):
+    # Writes answer with a redirect (Post/Redirect/Get), reads with the page
+    return status == (302 if method == 'POST' else 200)
+
+def latency_stats(results, seconds):
+    timings = sorted(elapsed for _, status, elapsed in results if status is not None)
+    failed = sum(1 for name, status, _ in results if not ok(name.split(' ')[0], status))
+    return {
+        'requests': len(results),
+        'throughput_rps': round(len(results) / seconds, 2) if seconds else 0,
+        'p50_ms': round(percentile(timings, 50), 2) if timings else None,
+        'p95_ms': round(percentile(timings, 95), 2) if timings else None,
+        'p99_ms': round(percentile(timings, 99), 2) if timings else None,
+        'max_ms': round(timings[-1], 2) if timings else None,
+        'errors': failed,
+        'error_rate': round(failed / len(results), 4) if results else 0,
+    }
+
+def check_slos(overall, options):
+    """Returns the SLOs the run missed, as readable strings."""
+    missed = []
+    for key, limit in (('p95_ms', options.slo_p95_ms), ('p99_ms', options.slo_p99_ms)):
+        if limit is not None and (overall[key] is None or overall[key] > limit):
+            missed.append(f"{key} {overall[key]} > {limit:g}")
+    if options.slo_error_rate is not None and overall['error_rate'] > options.slo_error_rate:
+        missed.append(f"error_rate {overall['error_rate']} > {options.slo_error_rate:g}")
+    if options.slo_min_rps is not None and overall['throughput_rps'] < options.slo_min_rps:
+        missed.append(f"throughput_rps {overall['throughput_rps']} < {options.slo_min_rps:g}")
+    return missed
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the app over HTTP with concurrent simulated users.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Simulated users (one client thread each).')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds of load, after the warm-up.')
+    parser.add_argument('--warmup', type=float, default=3, help='Seconds of load that are not measured.')
+    parser.add_argument('--write-percent', type=float, default=30, help='Share of requests that log something.')
+    parser.add_argument('--think-ms', type=float, default=0, help='Mean pause between a user\'s requests.')
+    parser.add_argument('--years', type=float, default=1, help='Years of seeded history per user.')
+    parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout (seconds).')
+    parser.add_argument('--url', help='Test a running server instead of starting one (no seeding).')
+    parser.add_argument('--output', help='Also write the JSON report to this file.')
+    parser.add_argument('--slo-p95-ms', type=float, default=500, help='Highest allowed overall p95.')
+    parser.add_argument('--slo-p99-ms', type=float, default=None, help='Highest allowed overall p99.')
+    parser.add_argument('--slo-error-rate', type=float, default=0.01, help='Highest allowed share of failed requests.')
+    parser.add_argument('--slo-min-rps', type=float, default=None, help='Lowest allowed throughput (requests/s).')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.serve:
+        serve(options.port)
+        return
+
+    from benchmarks.datagen import BENCHMARK_PASSWORD
+
+    server = None
+    base_url = options.url
+    if not base_url:
+        # 1. Seed one user per simulated logger, then start the server on the seeded file
+        workdir = tempfile.mkdtemp(prefix='diet_tracker_load_')
+        environ = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load.db')}")
+        os.environ.update(environ)
+        from app import create_app
+        from benchmarks.datagen import populate
+        with create_app().app_context():
+            counts = populate(options.years, users=options.concurrency, food_items=200)
+        print(f"seeded {options.concurrency} user(s) x {options.years:g} year(s): {counts['food_entries']:,} food "
+              f"entries", file=sys.stderr)
+        port = free_port()
+        server = start_server(environ, port)
+        base_url = f'http://127.0.0.1:{port}'
+
+    try:
+        # 2. Every user requests pages until the deadline; the first --warmup seconds aren't kept
+        started = time.perf_counter()
+        warmup_until = started + options.warmup
+        deadline = warmup_until + options.duration
+        with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+            futures = [pool.submit(run_user, base_url, user_id, BENCHMARK_PASSWORD, options, deadline, warmup_until,
+                                   user_id) for user_id in range(1, options.concurrency + 1)]
+            results = [result for future in futures for result in future.result()]
+
+        # 3. The server's own count of exceptions, split into SQLite lock failures and the rest
+        server_failures = None
+        if server:
+            session = Session(base_url, options.timeout)
+            connection = http.client.HTTPConnection(session.host, session.port, timeout=options.timeout)
+            connection.request('GET', ERRORS_PATH)
+            server_failures = json.loads(connection.getresponse().read())
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    # 4. The report: overall, per route and the SLO verdict
+    by_route = {}
+    for result in results:
+        by_route.setdefault(result[0], []).append(result)
+    overall = latency_stats(results, options.duration)
+    missed = check_slos(overall, options)
+    report = {
+        'config': {'url': options.url or 'local', 'concurrency': options.concurrency, 'duration_s': options.duration,
+                   'warmup_s': options.warmup, 'write_percent': options.write_percent,
+                   'think_ms': options.think_ms, 'years': options.years},
+        'overall': overall,
+        'routes': {name: latency_stats(route_results, options.duration)
+                   for name, route_results in sorted(by_route.items())},
+        'server': server_failures,
+        'slo': {'p95_ms': options.slo_p95_ms, 'p99_ms': options.slo_p99_ms, 'error_rate': options.slo_error_rate,
+                'min_rps': options.slo_min_rps, 'passed': not missed, 'missed': missed},
+    }
+
+    print(json.dumps(report, indent=2))
+    if options.output:
+        with open(options.output, 'w') as stream:
+            json.dump(report, stream, indent=2)
+    if missed:
+        print("SLOs missed: " + '; '.join(missed), file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
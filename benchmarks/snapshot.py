@@ -0,0 +1,86 @@
+# benchmarks/snapshot.py - ORM Loads vs Memory-Mapped Columnar Snapshots
+# Seeds synthetic history, exports it with `export_snapshot`, then times the daily summary and
+# metric trends computed from ORM objects (.all() per table) against the same analytics run on
+# the memory-mapped snapshot, and checks that both paths give the same answer:
+#
+#   python -m benchmarks.snapshot --years 1 5 20
+#
+# Exits with status 1 if the snapshot results differ from the ORM results.
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+
+from benchmarks.suite import summarize, time_call
+
+def results_match(expected, actual):
+    """Compares two analytics results, allowing for float rounding in the summed columns."""
+    if isinstance(expected, dict):
+        return expected.keys() == actual.keys() and all(results_match(expected[key], actual[key]) for key in expected)
+    if isinstance(expected, (list, tuple)):
+        return len(expected) == len(actual) and all(map(results_match, expected, actual))
+    if isinstance(expected, float) or isinstance(actual, float):
+        return math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-6)
+    return expected == actual
+
+def run_volume(years, repeat, workdir):
+    from app import ActivityEntry, FoodEntry, WeighIn, create_app, db, export_snapshot
+    from benchmarks.datagen import populate
+    from snapshot import load_snapshot
+    from utils import (analyze_metric_trends, analyze_metric_trends_from_columns, calculate_daily_summary,
+                       calculate_daily_summary_from_columns)
+
+    app = create_app()
+
+    with app.app_context():
+        counts = populate(years)
+        print(f"\n{years:g} year(s): {counts['food_entries']:,} food entries, {counts['activity_entries']:,} activities, "
+              f"{counts['weighins']:,} weigh-ins")
+
+        def from_orm():
+            food = FoodEntry.query.filter_by(user_id=1).all()
+            activity = ActivityEntry.query.filter_by(user_id=1).all()
+            weighins = WeighIn.query.filter_by(user_id=1).order_by(WeighIn.date_logged, WeighIn.id).all()
+            result = calculate_daily_summary(food, activity, weighins), analyze_metric_trends(weighins)
+            db.session.expunge_all()
+            return result
+
+        directory = os.path.join(workdir, f'{years:g}y')
+        export_timings = time_call(lambda: export_snapshot(directory), 1)
+        orm_timings = time_call(from_orm, repeat)
+        expected = from_orm()
+        db.session.remove()
+
+    def from_snapshot():
+        tables = load_snapshot(directory).for_user(1)
+        return (calculate_daily_summary_from_columns(tables['food_entry'], tables['activity_entry'], tables['weigh_in']),
+                analyze_metric_trends_from_columns(tables['weigh_in']))
+
+    snapshot_timings = time_call(from_snapshot, repeat)
+    matches = results_match(expected, from_snapshot())
+
+    size = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names)
+    orm, mapped = summarize(orm_timings), summarize(snapshot_timings)
+    print(f"  export                     {export_timings[0]:9.1f} ms   ({size / 1e6:.1f} MB on disk)")
+    print(f"  ORM .all() + utils         median {orm['median_ms']:9.2f} ms")
+    print(f"  mmap snapshot + utils      median {mapped['median_ms']:9.2f} ms   "
+          f"(x{orm['median_ms'] / mapped['median_ms']:.1f} faster)")
+    print(f"  results match: {'yes' if matches else 'NO'}")
+    return matches
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ORM loads with memory-mapped snapshot analytics.')
+    parser.add_argument('--years', type=float, nargs='+', default=[1, 5, 20], help='History lengths to test.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per path.')
+    options = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='diet_tracker_snapshot_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    if not all([run_volume(years, options.repeat, workdir) for years in options.years]):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/startup.py - Cold Start: Import, create_app() and First Requests
+# Starts a fresh interpreter per run (as a worker boot does) and times, inside it, importing
+# Flask and Flask-SQLAlchemy, importing the app module, create_app(), the first request (the
+# login page) and the first /summary (which is where NumPy gets imported):
+#
+#   python -m benchmarks.startup --runs 10 --target-ms 200 --top 10
+#
+# Exits with status 1 if the median cold start (imports + create_app() + first request) misses
+# --target-ms.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.food_search import percentile
+
+PHASES = ('framework_import_ms', 'app_import_ms', 'create_app_ms', 'first_request_ms', 'cold_start_ms',
+          'first_summary_ms')
+
+def run_child():
+    """Child process: times each startup phase and prints them as JSON."""
+    started = time.perf_counter()
+    import flask
+    import flask_sqlalchemy
+    framework_done = time.perf_counter()
+    import app as app_module
+    imported = time.perf_counter()
+    app = app_module.create_app()
+    created = time.perf_counter()
+    client = app.test_client()
+    response = client.get('/login')
+    first_request = time.perf_counter()
+    if response.status_code != 200:
+        raise RuntimeError(f"/login returned {response.status_code}")
+    heavy_modules = sorted(name for name in ('numpy', 'alembic', 'flask_migrate') if name in sys.modules)
+
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+        session['username'] = 'user1'
+    summary_started = time.perf_counter()
+    response = client.get('/summary')
+    summary_done = time.perf_counter()
+    if response.status_code != 200:
+        raise RuntimeError(f"/summary returned {response.status_code}")
+
+    print(json.dumps({
+        'framework_import_ms': (framework_done - started) * 1000,
+        'app_import_ms': (imported - framework_done) * 1000,
+        'create_app_ms': (created - imported) * 1000,
+        'first_request_ms': (first_request - created) * 1000,
+        'cold_start_ms': (first_request - started) * 1000,
+        'first_summary_ms': (summary_done - summary_started) * 1000,
+        'heavy_modules_loaded_at_boot': heavy_modules,
+    }))
+
+def slowest_imports(environ, count):
+    """The `count` modules with the largest cumulative time in `python -X importtime -c 'import app'`."""
+    child = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app; app.create_app()'],
+                           env=environ, capture_output=True, text=True, check=True)
+    rows = []
+    for line in child.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line and 'cumulative' not in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description='Time a cold start of the app in fresh interpreters.')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters to start.')
+    parser.add_argument('--target-ms', type=float, default=200, help='Allowed median cold start.')
+    parser.add_argument('--top', type=int, default=0, help='Also list the N slowest imports.')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.child:
+        run_child()
+        return
+
+    # A small seeded database, so /summary has something to compute
+    workdir = tempfile.mkdtemp(prefix='diet_tracker_startup_')
+    environ = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'startup.db')}")
+    os.environ.update(environ)
+    from app import create_app
+    from benchmarks.datagen import populate
+    with create_app().app_context():
+        populate(0.25)
+
+    interpreter = []
+    results = {phase: [] for phase in PHASES}
+    for _ in range(options.runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], env=environ, check=True)
+        interpreter.append((time.perf_counter() - started) * 1000)
+
+        child = subprocess.run([sys.executable, '-m', 'benchmarks.startup', '--child'],
+                               env=environ, capture_output=True, text=True)
+        if child.returncode != 0:
+            sys.exit(f"Startup run failed:\n{child.stderr}")
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        for phase in PHASES:
+            results[phase].append(result[phase])
+
+    print(f"{options.runs} fresh interpreters (bare interpreter start: median {statistics.median(interpreter):.1f} ms)")
+    print(f"heavy modules loaded at boot: {', '.join(result['heavy_modules_loaded_at_boot']) or 'none'}")
+    for phase, timings in results.items():
+        timings.sort()
+        print(f"  {phase:<20} median {statistics.median(timings):8.1f} ms   p95 {percentile(timings, 95):8.1f} ms")
+
+    if options.top:
+        print("\nslowest imports (cumulative, from -X importtime):")
+        for cumulative_ms, name in slowest_imports(environ, options.top):
+            print(f"  {cumulative_ms:8.1f} ms  {name}")
+
+    cold_start = statistics.median(results['cold_start_ms'])
+    framework = statistics.median(results['framework_import_ms'])
+    print(f"\ncold start {cold_start:.1f} ms ({cold_start - framework:.1f} ms of it after Flask and "
+          f"Flask-SQLAlchemy are imported), target {options.target_ms:g} ms: "
+          f"{'met' if cold_start <= options.target_ms else 'MISSED'}")
+    if cold_start > options.target_ms:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+# benchmarks/suite.py - Regression Benchmark Suite
+# Seeds a temporary SQLite database with 1 to 20 years of synthetic history, then times the utils
+# analytics and every Flask route through the test client. Results are written to a JSON file that
+# can serve as the baseline of a later run:
+#
+#   python -m benchmarks.suite --years 1 5 20 --output baseline.json
+#   python -m benchmarks.suite --years 1 5 20 --compare baseline.json --threshold 0.25
+#
+# In compare mode the exit status is 1 if any benchmark's median got slower than the threshold.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# (name, method, url, form data) for every route; POSTs write one new row per call
+ROUTES = (
+    ('GET /', 'GET', '/', None),
+    ('GET /manage_food', 'GET', '/manage_food', None),
+    ('GET /api/foods/search', 'GET', '/api/foods/search?q=chi', None),
+    ('GET /log/activity', 'GET', '/log/activity', None),
+    ('GET /log/metrics', 'GET', '/log/metrics', None),
+    ('GET /summary', 'GET', '/summary', None),
+    ('GET /summary?granularity=week', 'GET', '/summary?granularity=week', None),
+    ('GET /summary?granularity=year', 'GET', '/summary?granularity=year', None),
+    ('GET /history', 'GET', '/history', None),
+    ('GET /history (deep page)', 'GET', '/history?after={oldest_cursor}', None),
+    ('GET /history?format=csv', 'GET', '/history?format=csv', None),
+    ('GET /import', 'GET', '/import', None),
+    ('GET /meals', 'GET', '/meals', None),
+    ('GET /goal', 'GET', '/goal', None),
+    ('POST /', 'POST', '/', {'food_item_id': '1', 'serving_multiplier': '1.5', 'notes': 'bench'}),
+    ('POST /log/activity', 'POST', '/log/activity',
+     {'activity_type': 'Walk', 'duration_minutes': '30', 'calories_burned': '200'}),
+    ('POST /log/metrics', 'POST', '/log/metrics', {'weight_lbs': '240', 'bmr_kcal': '2100'}),
+)
+
+def time_call(function, repeat):
+    """Runs function() `repeat` times and returns the timings in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def summarize(timings):
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'runs': len(timings),
+    }
+
+def run_volume(years, repeat, options):
+    """Seeds `years` of data and returns {benchmark name: timing summary}."""
+    from app import (ActivityEntry, FoodEntry, Meal, WeighIn, create_app, db, format_history_cursor, response_cache,
+                     snapshot_scheduler)
+    from benchmarks.datagen import populate
+    from utils import analyze_metric_trends, calculate_daily_summary
+
+    app = create_app()
+
+    results = {}
+    with app.app_context():
+        started = time.perf_counter()
+        counts = populate(years, food_items=options.food_items, foods_per_day=options.foods_per_day)
+        print(f"\n{years} year(s): seeded {counts['food_entries']:,} food entries, "
+              f"{counts['activity_entries']:,} activities, {counts['weighins']:,} weigh-ins "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        # utils functions run on pre-loaded ORM lists, so only the computation is timed
+        food = FoodEntry.query.all()
+        activity = ActivityEntry.query.all()
+        weighins = WeighIn.query.all()
+        results['utils.calculate_daily_summary'] = summarize(
+            time_call(lambda: calculate_daily_summary(food, activity, weighins), repeat))
+        results['utils.analyze_metric_trends'] = summarize(
+            time_call(lambda: analyze_metric_trends(weighins), repeat))
+
+        oldest = FoodEntry.query.order_by(FoodEntry.date_eaten, FoodEntry.id).first()
+        oldest_cursor = format_history_cursor(oldest)
+        db.session.remove()
+
+    # Every route needs a logged-in user: benchmark as user 1 (the only generated user)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+        session['username'] = 'user1'
+    # A goal below the generated weights, so /goal and /summary compute (and cache) a forecast
+    if client.post('/goal', data={'target_weight_lbs': '150'}).status_code != 302:
+        raise RuntimeError("POST /goal failed")
+    for name, method, url, data in ROUTES:
+        url = url.format(oldest_cursor=oldest_cursor)
+
+        def request(cold=True):
+            # Cold GETs drop the response cache first so the page is rendered from scratch
+            if cold:
+                response_cache.bump_version()
+            response = client.open(url, method=method, data=data)
+            # Drain streamed responses so the whole export is timed
+            response.get_data()
+            if response.status_code >= 400:
+                raise RuntimeError(f"{name} returned {response.status_code}")
+
+        results[name] = summarize(time_call(request, repeat))
+        if method == 'GET':
+            # The cached page is the one rendered once the summary snapshot refresh that the cold
+            # requests scheduled has landed
+            request()
+            snapshot_scheduler.run_pending(force=True)
+            request(cold=False)
+            results[f'{name} (cached)'] = summarize(time_call(lambda: request(cold=False), repeat))
+
+    # An offline sync of 500 mixed entries in one /api/v1/batch request (fresh idempotency keys each run)
+    sync_runs = []
+
+    def sync_batch():
+        run = len(sync_runs)
+        sync_runs.append(run)
+        items = [{'type': 'food', 'idempotency_key': f'sync-{run}-{index}', 'food_item_id': 1 + index % 50,
+                  'serving_multiplier': 1.5} for index in range(400)]
+        items += [{'type': 'activity', 'idempotency_key': f'sync-{run}-a{index}', 'activity_type': 'Walk',
+                   'duration_minutes': 30, 'calories_burned': 200} for index in range(80)]
+        items += [{'type': 'metrics', 'idempotency_key': f'sync-{run}-m{index}', 'weight_lbs': 240,
+                   'bmr_kcal': 2100} for index in range(20)]
+        response = client.post('/api/v1/batch', json=items)
+        if response.status_code != 201:
+            raise RuntimeError(f"POST /api/v1/batch returned {response.status_code}")
+
+    results['POST /api/v1/batch (500 entries)'] = summarize(time_call(sync_batch, repeat))
+
+    # A saved meal of 5 items, logged once and then repeated over 4 weeks (140 entries per request)
+    meal = {'name': 'Bench meal'}
+    for index in range(5):
+        meal[f'food_item_id_{index}'] = str(1 + index)
+        meal[f'serving_multiplier_{index}'] = '1.5'
+    if client.post('/meals', data=meal).status_code != 302:
+        raise RuntimeError("POST /meals failed")
+    with app.app_context():
+        meal_id = str(db.session.query(db.func.max(Meal.id)).scalar())
+        db.session.remove()
+
+    for name, form in (('POST /meals/log (1 day)', {'meal_id': meal_id, 'date_eaten': '2030-01-01'}),
+                       ('POST /meals/log (28 days)', {'meal_id': meal_id, 'date_eaten': '2030-02-01',
+                                                      'repeat_until': '2030-02-28'})):
+        def log_meal():
+            response = client.post('/meals/log', data=form)
+            if response.status_code != 302:
+                raise RuntimeError(f"{name} returned {response.status_code}")
+
+        results[name] = summarize(time_call(log_meal, repeat))
+
+    for name, result in results.items():
+        print(f"  {name:<43} median {result['median_ms']:9.2f} ms   min {result['min_ms']:9.2f} ms")
+
+    return {'counts': counts, 'benchmarks': results}
+
+def compare(current, baseline, threshold):
+    """Returns a list of (volume, benchmark, baseline ms, current ms) that slowed down past the threshold."""
+    regressions = []
+    for volume, data in current['volumes'].items():
+        baseline_benchmarks = baseline.get('volumes', {}).get(volume, {}).get('benchmarks', {})
+        for name, result in data['benchmarks'].items():
+            if name not in baseline_benchmarks:
+                continue
+            before = baseline_benchmarks[name]['median_ms']
+            after = result['median_ms']
+            if after > before * (1 + threshold):
+                regressions.append((volume, name, before, after))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Time utils analytics and every route on synthetic data.')
+    parser.add_argument('--years', type=float, nargs='+', default=[1, 5, 20],
+                        help='History lengths to benchmark (years of daily logs).')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark.')
+    parser.add_argument('--food-items', type=int, default=500, help='Food dictionary size.')
+    parser.add_argument('--foods-per-day', type=int, default=5, help='Average food entries per day.')
+    parser.add_argument('--output', metavar='PATH', help='Write the results to this JSON file.')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compare against a previous results file.')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown in compare mode (0.25 = 25%% slower).')
+    options = parser.parse_args()
+
+    # Point the app at a throwaway database before it is imported
+    workdir = tempfile.mkdtemp(prefix='diet_tracker_bench_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': options.repeat,
+        'volumes': {},
+    }
+    for years in options.years:
+        results['volumes'][f'{years:g}y'] = run_volume(years, options.repeat, options)
+
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(results, output, indent=2)
+        print(f"\nResults written to {options.output}")
+
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), options.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {options.threshold:.0%}:")
+            for volume, name, before, after in regressions:
+                print(f"  [{volume}] {name}: {before:.2f} ms -> {after:.2f} ms ({after / before - 1:+.0%})")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {options.threshold:.0%} against {options.compare}.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/summary_equivalence.py - Daily Summary Regression Check
+# Runs utils.calculate_daily_summary against a reference copy of the original implementation
+# (the per-day rescans over strftime'd dates) on randomized food/activity/weigh-in data sets
+# and reports every data set whose output differs:
+#
+#   python -m benchmarks.summary_equivalence [--datasets 500] [--seed 1]
+#
+# The reference fills in BMR the way the app does now, with the BMR of the last weigh-in on or
+# before each day (the first weigh-in's for earlier days), instead of the original fallback to
+# the latest weigh-in. Exits with status 1 if any data set differs.
+
+import argparse
+import copy
+import random
+import sys
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from utils import calculate_daily_summary
+
+def reference_daily_summary(food_entries, activity_entries, weighin_entries):
+    """The original O(days x entries) calculate_daily_summary, with today's BMR-as-of-date rule."""
+    daily_summary = {}
+    weighins = sorted(weighin_entries, key=lambda x: x.date_logged)
+
+    def bmr_as_of(day_str):
+        # Before the first weigh-in day, that day's BMR (the last one logged on it) applies
+        first_day = weighins[0].date_logged.strftime('%Y-%m-%d') if weighins else None
+        bmr = 0
+        for entry in weighins:
+            if entry.date_logged.strftime('%Y-%m-%d') <= max(day_str, first_day):
+                bmr = entry.bmr_kcal
+        return bmr
+
+    all_dates = set(e.date_eaten.strftime('%Y-%m-%d') for e in food_entries)
+    all_dates.update(e.date_logged.strftime('%Y-%m-%d') for e in activity_entries)
+
+    for day_str in all_dates:
+        daily_summary[day_str] = {
+            "calories_consumed": sum(e.calories for e in food_entries if e.date_eaten.strftime('%Y-%m-%d') == day_str),
+            "protein_consumed": sum(e.protein for e in food_entries if e.date_eaten.strftime('%Y-%m-%d') == day_str),
+            "carbs_consumed": sum(e.carbs for e in food_entries if e.date_eaten.strftime('%Y-%m-%d') == day_str),
+            "fat_consumed": sum(e.fat for e in food_entries if e.date_eaten.strftime('%Y-%m-%d') == day_str),
+            "calories_burned": sum(e.calories_burned for e in activity_entries if e.date_logged.strftime('%Y-%m-%d') == day_str),
+            "bmr": bmr_as_of(day_str),
+        }
+
+    for day_data in daily_summary.values():
+        day_data["total_expenditure"] = day_data["bmr"] + day_data["calories_burned"]
+        day_data["cal_deficit_surplus"] = day_data["calories_consumed"] - day_data["total_expenditure"]
+
+    final_list = [dict(date=k, **v) for k, v in daily_summary.items()]
+    final_list.sort(key=lambda x: x['date'], reverse=True)
+    return final_list
+
+def make_dataset(rng):
+    """Random entries over up to 60 days, including empty tables and days with several weigh-ins."""
+    start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 365))
+
+    def day():
+        return start + timedelta(days=rng.randint(0, rng.choice([0, 7, 60])))
+
+    food = [SimpleNamespace(date_eaten=day(), calories=rng.randint(0, 900), protein=rng.uniform(0, 60),
+                            carbs=rng.uniform(0, 90), fat=rng.uniform(0, 40))
+            for _ in range(rng.choice([0, 1, 5, 50, 300]))]
+    activity = [SimpleNamespace(date_logged=day(), calories_burned=rng.randint(0, 800))
+                for _ in range(rng.choice([0, 1, 5, 40]))]
+    weighins = [SimpleNamespace(date_logged=day(), bmr_kcal=rng.randint(1200, 2400))
+                for _ in range(rng.choice([0, 1, 2, 10]))]
+    # Ties on one day: the last one logged wins in both implementations
+    rng.shuffle(weighins)
+    return food, activity, weighins
+
+def summaries_match(expected, actual):
+    """Exact match, except that summed float macros may differ in their last bits."""
+    if len(expected) != len(actual):
+        return False
+    for want, got in zip(expected, actual):
+        if want.keys() != got.keys():
+            return False
+        for key, value in want.items():
+            if isinstance(value, float) and abs(value - got[key]) > 1e-6:
+                return False
+            if not isinstance(value, float) and value != got[key]:
+                return False
+    return True
+
+def run(datasets, seed):
+    rng = random.Random(seed)
+    mismatches = []
+
+    for number in range(datasets):
+        food, activity, weighins = make_dataset(rng)
+        # The weigh-ins only reach the reference as a sorted copy, so ties keep the order logged
+        weighins_before = copy.copy(weighins)
+        expected = reference_daily_summary(food, activity, weighins)
+        actual = calculate_daily_summary(food, activity, weighins)
+
+        if not summaries_match(expected, actual) or weighins != weighins_before:
+            mismatches.append(number)
+
+    print(f"{datasets} data sets, {len(mismatches)} mismatches" +
+          (f" (first: data set {mismatches[0]})" if mismatches else ""))
+    return not mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description='Check calculate_daily_summary against the original implementation.')
+    parser.add_argument('--datasets', type=int, default=500, help='Random data sets to compare.')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed, to reproduce a failure.')
+    options = parser.parse_args()
+
+    if not run(options.datasets, options.seed):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/tenancy.py - Per-User Latency as the User Count Grows
+# Seeds the same history for 1, 10, 100 and 1000 users and times a cold (uncached) /summary for a
+# sample of them. Every per-user query is an index range on (user_id, date), so the latency should
+# stay flat while the tables grow a thousandfold:
+#
+#   python -m benchmarks.tenancy --users 1 10 100 1000 --years 0.5
+#
+# Exits with status 1 if the median at the largest user count is more than --max-growth slower
+# than at the smallest.
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.food_search import percentile
+
+def time_summaries(client, user_ids, repeat, response_cache):
+    """Returns the cold /summary timings (ms) of every sampled user."""
+    timings = []
+    for position, user_id in enumerate(user_ids):
+        with client.session_transaction() as session:
+            session['user_id'] = user_id
+            session['username'] = f'user{user_id}'
+        if position == 0:
+            # Untimed warm-up (template compilation, first connection)
+            client.get('/summary')
+        for _ in range(repeat):
+            # Drop the user's cached pages so the summary is computed from the database
+            response_cache.bump_version(user_id)
+            started = time.perf_counter()
+            response = client.get('/summary')
+            timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise RuntimeError(f"/summary returned {response.status_code} for user {user_id}")
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description='Show that per-user /summary latency is independent of the user count.')
+    parser.add_argument('--users', type=int, nargs='+', default=[1, 10, 100, 1000], help='Total user counts to test.')
+    parser.add_argument('--years', type=float, default=0.5, help='Years of history per user.')
+    parser.add_argument('--sample', type=int, default=20, help='Users whose /summary is timed at each count.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed /summary loads per sampled user.')
+    parser.add_argument('--max-growth', type=float, default=0.5,
+                        help='Allowed median slowdown from the smallest to the largest user count (0.5 = 50%%).')
+    options = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='diet_tracker_tenancy_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'tenancy.db')}"
+    from app import create_app, response_cache
+    from benchmarks.datagen import populate
+
+    app = create_app()
+
+    client = app.test_client()
+    medians = {}
+    print(f"{'users':>7} {'food rows':>11} {'seed s':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for users in sorted(options.users):
+        with app.app_context():
+            started = time.perf_counter()
+            counts = populate(options.years, users=users)
+            seeded = time.perf_counter() - started
+
+        # Spread the sample over the whole id range (first, last and evenly in between)
+        sample = min(options.sample, users)
+        user_ids = sorted({1 + round(index * (users - 1) / max(sample - 1, 1)) for index in range(sample)})
+        timings = sorted(time_summaries(client, user_ids, options.repeat, response_cache))
+        medians[users] = statistics.median(timings)
+        print(f"{users:>7,} {counts['food_entries']:>11,} {seeded:>8.1f} {medians[users]:>9.2f} "
+              f"{percentile(timings, 95):>9.2f} {timings[-1]:>9.2f}")
+
+    smallest, largest = min(medians), max(medians)
+    growth = medians[largest] / medians[smallest] - 1
+    print(f"\nMedian /summary latency changed by {growth:+.0%} from {smallest:,} to {largest:,} users.")
+    if growth > options.max_growth:
+        print(f"That is more than the allowed {options.max_growth:.0%}.")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
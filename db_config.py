@@ -0,0 +1,87 @@
+# db_config.py - Database Engine Configuration
+# Reads the database URI, connection pool settings and SQLite PRAGMAs from the environment.
+# SQLite (the default) runs in WAL mode with synchronous=NORMAL, so readers never block the
+# writer and a commit doesn't wait for an fsync; concurrent writers queue on busy_timeout
+# instead of failing with "database is locked". Any other SQLAlchemy URL (e.g. PostgreSQL)
+# gets a pre-pinged, recycled connection pool instead.
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+DEFAULT_DATABASE_URI = 'sqlite:///site.db'
+
+# PRAGMA name -> (environment variable, default). Applied to every new SQLite connection.
+SQLITE_PRAGMA_SETTINGS = {
+    'journal_mode': ('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': ('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': ('SQLITE_BUSY_TIMEOUT', 5000),          # ms to wait for the write lock
+    'cache_size': ('SQLITE_CACHE_SIZE', -64000),            # negative = KiB, i.e. 64 MB
+    'mmap_size': ('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),   # bytes of the file read through mmap
+    'temp_store': ('SQLITE_TEMP_STORE', 'MEMORY'),
+}
+
+# Engine option -> (environment variable, default) for pooled (non-SQLite) databases
+POOL_SETTINGS = {
+    'pool_size': ('DB_POOL_SIZE', 10),
+    'max_overflow': ('DB_MAX_OVERFLOW', 20),
+    'pool_timeout': ('DB_POOL_TIMEOUT', 30),
+    'pool_recycle': ('DB_POOL_RECYCLE', 1800),
+}
+
+def _setting(environ, name, default):
+    value = environ.get(name)
+    if value is None or value == '':
+        return default
+    return int(value) if isinstance(default, int) else value
+
+def database_uri(environ):
+    """
+    Returns DATABASE_URL, or sqlite:///site.db when it isn't set. The 'postgres://' scheme
+    some hosts hand out is rewritten to the 'postgresql://' SQLAlchemy expects.
+    """
+    uri = environ.get('DATABASE_URL') or DEFAULT_DATABASE_URI
+    if uri.startswith('postgres://'):
+        uri = 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+def is_file_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+def engine_options(uri, environ):
+    """
+    Returns SQLALCHEMY_ENGINE_OPTIONS for the URI. SQLite file databases keep SQLAlchemy's
+    default QueuePool (one connection per thread is reused; PRAGMAs are set per connection);
+    other databases get a sized pool with pre-ping and recycling.
+    """
+    if make_url(uri).get_backend_name() == 'sqlite':
+        options = {'pool_size': _setting(environ, 'DB_POOL_SIZE', 10),
+                   'max_overflow': _setting(environ, 'DB_MAX_OVERFLOW', 20)} if is_file_sqlite(uri) else {}
+        # The driver-level timeout matches busy_timeout, so a locked database is waited on
+        options['connect_args'] = {'timeout': _setting(environ, 'SQLITE_BUSY_TIMEOUT', 5000) / 1000}
+        return options
+
+    options = {name: _setting(environ, variable, default) for name, (variable, default) in POOL_SETTINGS.items()}
+    options['pool_pre_ping'] = True
+    return options
+
+def sqlite_pragmas(environ):
+    """Returns the {pragma: value} to apply to SQLite connections, with environment overrides."""
+    return {pragma: _setting(environ, variable, default)
+            for pragma, (variable, default) in SQLITE_PRAGMA_SETTINGS.items()}
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """Runs the PRAGMAs on every new connection of a SQLite file engine (no-op for other engines)."""
+    if not is_file_sqlite(str(engine.url)):
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, value in pragmas.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+        cursor.close()
+
+def describe_sqlite_settings(connection):
+    """Reads back the effective PRAGMA values of an open SQLite connection (for diagnostics)."""
+    return {pragma: connection.exec_driver_sql(f'PRAGMA {pragma}').scalar() for pragma in SQLITE_PRAGMA_SETTINGS}
@@ -0,0 +1,134 @@
+# food_cache.py - In-Process Food Dictionary Cache
+# The food dictionary is read on every GET of / and /manage_food and on every food log POST,
+# but only changes when an item is added or edited. This keeps a read-only copy in memory so
+# those hot paths stop querying the database.
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# Detached, immutable copy of a FoodItem row (safe to share between requests and threads)
+FoodSnapshot = namedtuple('FoodSnapshot', ['id', 'name', 'calories', 'protein', 'carbs', 'fat'])
+
+def snapshot_food_item(item):
+    """Copies the columns of a FoodItem (or any row with the same attributes) into a FoodSnapshot."""
+    return FoodSnapshot(item.id, item.name, item.calories, item.protein, item.carbs, item.fat)
+
+class FoodDictionaryCache:
+    """
+    Versioned cache of the food dictionary.
+
+    load_all() must return every item as FoodSnapshots sorted by name; load_one(item_id)
+    returns a single FoodSnapshot or None. invalidate() bumps the version and drops
+    everything, so writers call it after committing a dictionary change.
+
+    The cache lives in one process. Other workers pick up changes when their copy is older
+    than max_age seconds, and an id missing from a stale copy is always re-checked in the
+    database, so a new item can never be reported as "not found". Code that copies macros
+    into new rows calls sync() first: it compares load_version() (a counter the writers bump
+    in the database) with the one the copy was loaded under, so no worker logs an entry with
+    the macros of an item another worker has since edited.
+    """
+
+    def __init__(self, load_all, load_one, lru_size=1024, max_age=300, load_version=None):
+        self._load_all = load_all
+        self._load_one = load_one
+        self._load_version = load_version
+        self._lru_size = lru_size
+        self._max_age = max_age
+        self._lock = threading.Lock()
+
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._items = None
+        self._by_id = None
+        self._loaded_at = 0
+        self._lru = OrderedDict()
+        self._source_version = None   # load_version() when the cached items were last known current
+
+    def all_items(self):
+        """Returns every food item sorted by name, loading the dictionary on a miss."""
+        items = self._items
+        if items is not None and time.monotonic() - self._loaded_at < self._max_age:
+            self.hits += 1
+            return items
+
+        self.misses += 1
+        version = self.version
+        items = list(self._load_all())
+        with self._lock:
+            # Don't store a copy that was loaded while a writer invalidated the cache
+            if version == self.version:
+                self._items = items
+                self._by_id = {item.id: item for item in items}
+                self._loaded_at = time.monotonic()
+        return items
+
+    def get(self, item_id):
+        """Returns the FoodSnapshot for an id (or None), checking the full copy, then the LRU."""
+        by_id = self._by_id
+        if by_id is not None and item_id in by_id:
+            self.hits += 1
+            return by_id[item_id]
+
+        if self._lru_size:
+            with self._lock:
+                if item_id in self._lru:
+                    self._lru.move_to_end(item_id)
+                    self.hits += 1
+                    return self._lru[item_id]
+
+        self.misses += 1
+        version = self.version
+        item = self._load_one(item_id)
+        if item is not None and self._lru_size:
+            with self._lock:
+                if version == self.version:
+                    self._lru[item_id] = item
+                    # Evict the least recently used item once the LRU is full
+                    if len(self._lru) > self._lru_size:
+                        self._lru.popitem(last=False)
+        return item
+
+    def sync(self):
+        """
+        Drops everything cached if the database's dictionary version moved on, and returns that
+        version (None without load_version). Costs one load_version() call.
+        """
+        if self._load_version is None:
+            return None
+        source_version = self._load_version()
+        if source_version == self._source_version:
+            return source_version
+        self.invalidate()
+        with self._lock:
+            self._source_version = source_version
+        return source_version
+
+    def configure(self, lru_size=None, max_age=None):
+        """Changes the LRU size and max age (e.g. from the app config) and drops everything cached."""
+        if lru_size is not None:
+            self._lru_size = lru_size
+        if max_age is not None:
+            self._max_age = max_age
+        self.invalidate()
+
+    def invalidate(self):
+        """Drops all cached items after the dictionary changed."""
+        with self._lock:
+            self.version += 1
+            self._items = None
+            self._by_id = None
+            self._lru.clear()
+
+    def stats(self):
+        """Returns the version, hit/miss counters and current sizes."""
+        return {
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'items': len(self._items) if self._items is not None else 0,
+            'lru_items': len(self._lru),
+        }
@@ -0,0 +1,88 @@
+# food_search.py - Food Dictionary Prefix Search
+# In-memory sorted prefix index over FoodItem names, used by the /api/foods/search autocomplete.
+# Lookups are a couple of binary searches plus a walk over at most a handful of matches, so they
+# stay in the sub-millisecond range even with a million dictionary items.
+
+import re
+from bisect import bisect_left
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Sorts after every character that can appear in a normalized word
+PREFIX_END = '\U0010ffff'
+
+def tokenize(text):
+    """Splits text into lowercase words ('93/7 Ground Beef' -> ['93', '7', 'ground', 'beef'])."""
+    return WORD_PATTERN.findall(text.lower())
+
+class FoodSearchIndex:
+    """
+    Prefix index over a list of food items (anything with a .name, e.g. FoodSnapshot).
+
+    Matches are ranked in two tiers:
+    1. names that start with the whole query, alphabetically;
+    2. names where every query word is the start of one of the name's words, ordered by the
+       matched word and then by name (so 'chi' lists 'chicken ...' before 'chili ...').
+    """
+
+    def __init__(self, items):
+        self.items = items
+
+        # " word word ..." per item, used to check the remaining query words of a candidate
+        self._normalized = [' ' + ' '.join(tokenize(item.name)) for item in items]
+
+        # Tier 1: whole normalized names, sorted
+        names = sorted((normalized[1:], position) for position, normalized in enumerate(self._normalized))
+        self._names = [name for name, _ in names]
+        self._name_positions = [position for _, position in names]
+
+        # Tier 2: every (word, item) pair, sorted by word then item
+        words = [(word, position)
+                 for position, normalized in enumerate(self._normalized)
+                 for word in dict.fromkeys(normalized.split())]
+        words.sort()
+        self._words = [word for word, _ in words]
+        self._word_positions = [position for _, position in words]
+
+    def __len__(self):
+        return len(self.items)
+
+    def search(self, query, limit=10):
+        """Returns up to `limit` items matching the query, best matches first."""
+        terms = tokenize(query)
+        if not terms or limit <= 0:
+            return []
+
+        matches = []
+        seen = set()
+
+        # 1. Names starting with the full query
+        phrase = ' '.join(terms)
+        start = bisect_left(self._names, phrase)
+        for index in range(start, min(start + limit, len(self._names))):
+            if not self._names[index].startswith(phrase):
+                break
+            position = self._name_positions[index]
+            seen.add(position)
+            matches.append(position)
+
+        # 2. Names where every term prefixes a word. Walk the most selective term's range
+        #    and check the other terms against each candidate's words.
+        if len(matches) < limit:
+            ranges = [(bisect_left(self._words, term), bisect_left(self._words, term + PREFIX_END), term)
+                      for term in terms]
+            start, end, walk_term = min(ranges, key=lambda r: r[1] - r[0])
+            other_terms = [' ' + term for term in terms if term != walk_term]
+
+            for index in range(start, end):
+                position = self._word_positions[index]
+                if position in seen:
+                    continue
+                normalized = self._normalized[position]
+                if all(term in normalized for term in other_terms):
+                    seen.add(position)
+                    matches.append(position)
+                    if len(matches) >= limit:
+                        break
+
+        return [self.items[position] for position in matches]
@@ -0,0 +1,146 @@
+# importer.py - Bulk Import Readers
+# Streams rows out of CSV / JSON exports (food logs, tracker activities, BeWell scale weigh-ins)
+# and maps their column headers onto model field names. Validation and the batched database
+# inserts live in app.py so they share the exact rules of the logging forms.
+
+import csv
+import json
+import re
+from datetime import datetime
+from itertools import chain, islice
+
+IMPORT_KINDS = ('food', 'activity', 'metrics')
+IMPORT_FORMATS = ('csv', 'json')
+
+# Date field each kind of row is logged under
+DATE_FIELDS = {
+    'food': 'date_eaten',
+    'activity': 'date_logged',
+    'metrics': 'date_logged',
+}
+
+# Header aliases seen in tracker and BeWell scale exports, compared after normalize_header().
+# Every model field name is also accepted as-is.
+FIELD_ALIASES = {
+    'food': {
+        'food': 'food_name', 'name': 'food_name', 'item': 'food_name', 'fooditem': 'food_name',
+        'itemid': 'food_item_id',
+        'servings': 'serving_multiplier', 'multiplier': 'serving_multiplier',
+        'note': 'notes',
+    },
+    'activity': {
+        'activity': 'activity_type', 'type': 'activity_type', 'workout': 'activity_type',
+        'duration': 'duration_minutes', 'minutes': 'duration_minutes', 'durationmin': 'duration_minutes',
+        'calories': 'calories_burned', 'kcal': 'calories_burned', 'activecalories': 'calories_burned',
+        'distance': 'distance_miles', 'miles': 'distance_miles', 'distancemi': 'distance_miles',
+        'note': 'notes',
+    },
+    'metrics': {
+        'weight': 'weight_lbs', 'weightlb': 'weight_lbs',
+        'bodyfat': 'fat_pct', 'fat': 'fat_pct', 'bodyfatpct': 'fat_pct',
+        'bmr': 'bmr_kcal', 'bmrkcalday': 'bmr_kcal',
+        'visceralfatindex': 'visceral_fat',
+        'muscle': 'muscle_lbs', 'musclemass': 'muscle_lbs', 'musclemasslb': 'muscle_lbs', 'musclelb': 'muscle_lbs',
+        'bonemass': 'bone_mass_lbs', 'bonemasslb': 'bone_mass_lbs', 'bonelb': 'bone_mass_lbs',
+        'protein': 'protein_pct', 'proteinrate': 'protein_pct',
+        'water': 'water_pct', 'bodywater': 'water_pct', 'bodywaterpct': 'water_pct',
+        'skeletalmuscle': 'skeletal_muscle_lbs', 'skeletalmusclelb': 'skeletal_muscle_lbs',
+        'skeletalmusclemass': 'skeletal_muscle_lbs',
+    },
+}
+
+FIELD_NAMES = {
+    'food': ('food_item_id', 'food_name', 'serving_multiplier', 'notes', 'date_eaten'),
+    'activity': ('activity_type', 'duration_minutes', 'calories_burned', 'distance_miles', 'notes', 'date_logged'),
+    'metrics': ('date_logged', 'weight_lbs', 'fat_pct', 'bmi', 'bmr_kcal', 'visceral_fat', 'muscle_lbs',
+                'bone_mass_lbs', 'protein_pct', 'water_pct', 'skeletal_muscle_lbs'),
+}
+
+# Date/time layouts accepted in exports; every one is rewritten to the YYYY-MM-DD the forms send
+EXPORT_DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%m/%d/%Y')
+
+def normalize_header(header):
+    """Lowercases a header and drops everything but letters and digits ('Weight(lb)' -> 'weightlb')."""
+    return re.sub(r'[^a-z0-9]', '', str(header).lower())
+
+def build_field_map(headers, kind):
+    """Maps each raw header to the model field it holds (or None if the column is ignored)."""
+    lookup = {normalize_header(field): field for field in FIELD_NAMES[kind]}
+    lookup.update(FIELD_ALIASES[kind])
+    for alias in ('date', 'day', 'datetime', 'time', 'measuredat', 'timestamp'):
+        lookup[alias] = DATE_FIELDS[kind]
+    return {header: lookup.get(normalize_header(header)) for header in headers}
+
+def normalize_export_date(value):
+    """Rewrites export dates such as '2024-03-05 07:31:12' or '03/05/2024' to 'YYYY-MM-DD'."""
+    if not value or not isinstance(value, str):
+        return value
+    # Fast path: already in the form's layout (validation still checks it's a real date)
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        return value
+    day_part = re.split(r'[ T]', value.strip(), maxsplit=1)[0]
+    for date_format in EXPORT_DATE_FORMATS:
+        try:
+            return datetime.strptime(day_part, date_format).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    # Leave it untouched so validation reports it like any other bad date
+    return value
+
+def detect_format(filename):
+    """Guesses the import format from a file name ('.csv' or '.json'/'.jsonl'/'.ndjson')."""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return 'json' if extension in ('json', 'jsonl', 'ndjson') else 'csv'
+
+def iter_records(stream, kind, file_format):
+    """
+    Yields (line_number, record) pairs from a text stream, where record maps model field
+    names to raw values. CSV and JSON Lines are read one row at a time; a file starting
+    with '[' is a single JSON array and has to be parsed as a whole.
+    """
+    date_field = DATE_FIELDS[kind]
+
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        field_map = build_field_map(reader.fieldnames or [], kind)
+        for row in reader:
+            record = {field_map[header]: value for header, value in row.items() if field_map.get(header)}
+            record[date_field] = normalize_export_date(record.get(date_field))
+            yield reader.line_num, record
+        return
+
+    first_line = stream.readline()
+    if first_line.lstrip().startswith('['):
+        lines = enumerate(json.loads(first_line + stream.read()), start=1)
+    else:
+        lines = _iter_json_lines(first_line, stream)
+
+    field_maps = {}
+    for number, item in lines:
+        if not isinstance(item, dict):
+            yield number, None
+            continue
+        # JSON objects usually share keys, so remember the mapping per key set
+        keys = tuple(item)
+        if keys not in field_maps:
+            field_maps[keys] = build_field_map(keys, kind)
+        field_map = field_maps[keys]
+        record = {field_map[key]: value for key, value in item.items() if field_map.get(key)}
+        record[date_field] = normalize_export_date(record.get(date_field))
+        yield number, record
+
+def _iter_json_lines(first_line, stream):
+    """Yields (line_number, object) for each non-blank JSON Lines row; unparseable rows give None."""
+    for number, line in enumerate(chain([first_line], stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError:
+            yield number, None
+
+def batched(iterable, size):
+    """Yields lists of up to `size` items from an iterable without materializing it."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
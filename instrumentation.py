@@ -0,0 +1,346 @@
+# instrumentation.py - Opt-In Request Instrumentation
+# Splits every request's wall time into phases (SQL, ORM hydration, computation, template
+# rendering, everything else), counts SQL statements from SQLAlchemy engine events, warns about
+# N+1 query patterns and aggregates it all into histograms served at /metrics in the Prometheus
+# text format. A single request can also be captured with cProfile or pyinstrument.
+#
+# Nothing is hooked up unless the app enables it, so a normal run pays no overhead.
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import nullcontext
+
+from flask import Response, before_render_template, current_app, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapper
+
+try:
+    import pyinstrument
+except ImportError:  # optional: cProfile is used instead
+    pyinstrument = None
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 500)
+PHASES = ('sql', 'orm', 'compute', 'render', 'other')
+PROFILE_REPORT_LINES = 60
+
+# Endpoints that are never measured (the scrape itself and static files)
+UNMEASURED_ENDPOINTS = {'metrics', 'static'}
+
+WHITESPACE = re.compile(r'\s+')
+
+# --- PROMETHEUS METRICS ---
+def _format_labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+class MetricCounter:
+    """Monotonic counter with labels, rendered in the Prometheus text format."""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.label_names, labels)} {value:g}')
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in the Prometheus text format."""
+
+    def __init__(self, name, help_text, buckets, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = label_names
+        self._series = {}   # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    bucket_labels = _format_labels(self.label_names, labels, f'le="{bound:g}"')
+                    lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+                inf_labels = _format_labels(self.label_names, labels, 'le="+Inf"')
+                lines.append(f'{self.name}_bucket{inf_labels} {series[-1]}')
+                lines.append(f'{self.name}_sum{_format_labels(self.label_names, labels)} {series[-2]:.6f}')
+                lines.append(f'{self.name}_count{_format_labels(self.label_names, labels)} {series[-1]}')
+        return lines
+
+# --- PER-REQUEST TIMINGS ---
+class RequestTimings:
+    """
+    Phase timers for one request. Phases nest (SQL runs inside ORM loads, which run inside
+    template rendering when a relationship is lazy-loaded), so each phase is credited only
+    with its exclusive time and the wall time left over is reported as 'other'.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.sql_statements = Counter()
+        self.orm_objects = 0
+        self._stack = []    # [phase, started, time spent in nested phases]
+
+    def push(self, phase):
+        self._stack.append([phase, time.perf_counter(), 0.0])
+
+    def pop(self):
+        phase, started, nested = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.phases[phase] += elapsed - nested
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def finish(self):
+        """Closes any open phase and returns the total wall time in seconds."""
+        while self._stack:
+            self.pop()
+        total = time.perf_counter() - self.started
+        self.phases['other'] = max(total - sum(self.phases[phase] for phase in PHASES if phase != 'other'), 0.0)
+        return total
+
+    @property
+    def sql_count(self):
+        return sum(self.sql_statements.values())
+
+def current_timings():
+    """Returns the RequestTimings of the active request, or None outside a measured request."""
+    return g.get('_request_timings') if has_request_context() else None
+
+class _Phase:
+    """Context manager crediting the enclosed block to a phase of the current request."""
+    __slots__ = ('name', 'timings')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.timings = current_timings()
+        if self.timings is not None:
+            self.timings.push(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.timings is not None:
+            self.timings.pop()
+        return False
+
+# --- FLASK INTEGRATION ---
+class RequestInstrumentation:
+    """
+    Hooks request timing, SQL/ORM event listeners, N+1 detection, the /metrics endpoint and
+    on-demand profiling into a Flask app.
+
+    INSTRUMENTATION_ENABLED turns on the timers, histograms and /metrics. Statements run
+    INSTRUMENTATION_N_PLUS_ONE_THRESHOLD or more times in one request are logged as a likely
+    N+1 pattern. PROFILING_ENABLED lets ?profile=1 (or an 'X-Profile: 1' header) replace a
+    response with its profile; PROFILE_DIR additionally keeps every capture on disk.
+    """
+
+    def __init__(self, app=None, namespace='diet_tracker'):
+        self.enabled = False
+        self.profiling = False
+        self.n_plus_one_threshold = 10
+        self.profile_dir = None
+
+        self.request_duration = Histogram(f'{namespace}_request_duration_seconds',
+                                          'Wall time per request.', LATENCY_BUCKETS, ('endpoint', 'method'))
+        self.phase_duration = Histogram(f'{namespace}_request_phase_seconds',
+                                        'Exclusive time per request phase.', LATENCY_BUCKETS, ('endpoint', 'phase'))
+        self.sql_queries = Histogram(f'{namespace}_sql_queries_per_request',
+                                     'SQL statements executed per request.', QUERY_COUNT_BUCKETS, ('endpoint',))
+        self.orm_objects = Histogram(f'{namespace}_orm_objects_per_request',
+                                     'ORM instances loaded per request.', QUERY_COUNT_BUCKETS, ('endpoint',))
+        self.requests = MetricCounter(f'{namespace}_requests_total',
+                                 'Requests by endpoint, method and status.', ('endpoint', 'method', 'status'))
+        self.n_plus_one = MetricCounter(f'{namespace}_n_plus_one_total',
+                                   'Requests that repeated one SQL statement past the N+1 threshold.', ('endpoint',))
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('INSTRUMENTATION_ENABLED', False)
+        self.profiling = app.config.get('PROFILING_ENABLED', False)
+        self.n_plus_one_threshold = app.config.get('INSTRUMENTATION_N_PLUS_ONE_THRESHOLD', 10)
+        self.profile_dir = app.config.get('PROFILE_DIR')
+
+        if self.enabled:
+            app.before_request(self._start_request)
+            app.after_request(self._finish_request)
+            app.add_url_rule('/metrics', 'metrics', self._metrics_view)
+            before_render_template.connect(self._start_render, app)
+            template_rendered.connect(self._finish_render, app)
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            event.listen(Engine, 'handle_error', self._after_failed_execute)
+            event.listen(Mapper, 'load', self._orm_load)
+
+        if self.profiling:
+            app.before_request(self._start_profile)
+            app.after_request(self._finish_profile)
+
+    def phase(self, name):
+        """Times the enclosed block as `name` ('orm', 'compute', ...) when instrumentation is on."""
+        return _Phase(name) if self.enabled else nullcontext()
+
+    # Request lifecycle
+    def _start_request(self):
+        if request.endpoint not in UNMEASURED_ENDPOINTS:
+            g._request_timings = RequestTimings()
+
+    def _finish_request(self, response):
+        timings = g.pop('_request_timings', None)
+        if timings is None:
+            return response
+
+        total = timings.finish()
+        endpoint = request.endpoint or 'unknown'
+        self.request_duration.observe((endpoint, request.method), total)
+        for phase, seconds in timings.phases.items():
+            self.phase_duration.observe((endpoint, phase), seconds)
+        self.sql_queries.observe((endpoint,), timings.sql_count)
+        self.orm_objects.observe((endpoint,), timings.orm_objects)
+        self.requests.inc((endpoint, request.method, str(response.status_code)))
+        self._check_n_plus_one(endpoint, timings)
+
+        # Server-Timing shows the breakdown in the browser's network panel
+        server_timing = [f'{phase};dur={seconds * 1000:.2f}' for phase, seconds in timings.phases.items()]
+        server_timing.append(f'total;desc="{timings.sql_count} queries, {timings.orm_objects} objects";dur={total * 1000:.2f}')
+        response.headers['Server-Timing'] = ', '.join(server_timing)
+        return response
+
+    def _check_n_plus_one(self, endpoint, timings):
+        repeated = [(statement, count) for statement, count in timings.sql_statements.items()
+                    if count >= self.n_plus_one_threshold and statement.startswith('SELECT')]
+        if not repeated:
+            return
+        self.n_plus_one.inc((endpoint,))
+        for statement, count in repeated:
+            current_app.logger.warning("Possible N+1 query on %s: executed %d times in one request: %s",
+                                       endpoint, count, statement[:300])
+
+    def _metrics_view(self):
+        lines = []
+        for metric in (self.requests, self.request_duration, self.phase_duration,
+                       self.sql_queries, self.orm_objects, self.n_plus_one):
+            lines.extend(metric.render())
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+    # Template rendering (Flask signals)
+    def _start_render(self, sender, **extra):
+        timings = current_timings()
+        if timings is not None:
+            timings.push('render')
+
+    def _finish_render(self, sender, **extra):
+        timings = current_timings()
+        if timings is not None:
+            timings.pop()
+
+    # SQL and ORM (SQLAlchemy events)
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        timings = current_timings()
+        if timings is not None:
+            timings.push('sql')
+            timings.sql_statements[WHITESPACE.sub(' ', statement).strip()] += 1
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        timings = current_timings()
+        if timings is not None:
+            timings.pop()
+
+    def _after_failed_execute(self, exception_context):
+        timings = current_timings()
+        if timings is not None and timings._stack and timings._stack[-1][0] == 'sql':
+            timings.pop()
+
+    def _orm_load(self, target, context):
+        timings = current_timings()
+        if timings is not None:
+            timings.orm_objects += 1
+
+    # Profiling (?profile=1 or X-Profile: 1)
+    def _profile_requested(self):
+        flag = request.args.get('profile') or request.headers.get('X-Profile')
+        return flag if flag and flag != '0' else None
+
+    def _start_profile(self):
+        flag = self._profile_requested()
+        if not flag:
+            return
+        try:
+            if pyinstrument is not None and flag != 'cprofile':
+                profiler = pyinstrument.Profiler()
+                profiler.start()
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+        except (RuntimeError, ValueError):
+            # Another profiler is already active in this thread
+            return
+        g._profiler = profiler
+
+    def _finish_profile(self, response):
+        profiler = g.pop('_profiler', None)
+        if profiler is None:
+            return response
+
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(PROFILE_REPORT_LINES)
+            report, mimetype, extension = output.getvalue(), 'text/plain', 'prof'
+        else:
+            profiler.stop()
+            report, mimetype, extension = profiler.output_html(), 'text/html', 'html'
+
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(self.profile_dir, f"{request.endpoint or 'unknown'}-{time.time():.0f}.{extension}")
+            if extension == 'prof':
+                profiler.dump_stats(path)
+            else:
+                with open(path, 'w') as profile_file:
+                    profile_file.write(report)
+
+        return Response(report, mimetype=mimetype)
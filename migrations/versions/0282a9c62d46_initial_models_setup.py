@@ -0,0 +1,75 @@
+"""Initial models setup
+
+Revision ID: 0282a9c62d46
+Revises: 
+Create Date: 2026-10-17 09:12:41.508133
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0282a9c62d46'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('food_item',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('calories', sa.Integer(), nullable=False),
+    sa.Column('protein', sa.Float(), nullable=False),
+    sa.Column('carbs', sa.Float(), nullable=False),
+    sa.Column('fat', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('activity_entry',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('activity_type', sa.String(length=100), nullable=False),
+    sa.Column('duration_minutes', sa.Float(), nullable=False),
+    sa.Column('calories_burned', sa.Integer(), nullable=False),
+    sa.Column('distance_miles', sa.Float(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('date_logged', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('weigh_in',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('date_logged', sa.Date(), nullable=False),
+    sa.Column('weight_lbs', sa.Float(), nullable=False),
+    sa.Column('fat_pct', sa.Float(), nullable=False),
+    sa.Column('bmi', sa.Float(), nullable=False),
+    sa.Column('bmr_kcal', sa.Float(), nullable=False),
+    sa.Column('visceral_fat', sa.Float(), nullable=False),
+    sa.Column('muscle_lbs', sa.Float(), nullable=False),
+    sa.Column('bone_mass_lbs', sa.Float(), nullable=False),
+    sa.Column('protein_pct', sa.Float(), nullable=False),
+    sa.Column('water_pct', sa.Float(), nullable=False),
+    sa.Column('skeletal_muscle_lbs', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('food_entry',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('food_item_id', sa.Integer(), nullable=False),
+    sa.Column('food_name', sa.String(length=100), nullable=False),
+    sa.Column('serving_multiplier', sa.Float(), nullable=True),
+    sa.Column('calories', sa.Integer(), nullable=False),
+    sa.Column('protein', sa.Float(), nullable=True),
+    sa.Column('carbs', sa.Float(), nullable=True),
+    sa.Column('fat', sa.Float(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('date_eaten', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['food_item_id'], ['food_item.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('food_entry')
+    op.drop_table('weigh_in')
+    op.drop_table('activity_entry')
+    op.drop_table('food_item')
@@ -0,0 +1,43 @@
+"""Drop daily_rollup.bmr_kcal (each day's BMR is looked up from the weigh-ins)
+
+Revision ID: 0c9e4d7a5f18
+Revises: f5c1b8e3a27d
+Create Date: 2026-10-18 22:41:09.538120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c9e4d7a5f18'
+down_revision = 'f5c1b8e3a27d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows kept only for a weigh-in's BMR have no totals left to hold
+    op.execute("DELETE FROM daily_rollup WHERE food_entries = 0 AND activity_entries = 0")
+    with op.batch_alter_table('daily_rollup', schema=None) as batch_op:
+        batch_op.drop_column('bmr_kcal')
+
+
+def downgrade():
+    with op.batch_alter_table('daily_rollup', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('bmr_kcal', sa.Float(), nullable=True))
+
+    # Every weigh-in day gets a row again, carrying the BMR of its newest weigh-in
+    op.execute("""
+        INSERT INTO daily_rollup (user_id, date, calories_consumed, protein_consumed, carbs_consumed,
+                                  fat_consumed, calories_burned, food_entries, activity_entries)
+        SELECT DISTINCT user_id, date_logged, 0, 0, 0, 0, 0, 0, 0 FROM weigh_in
+        WHERE NOT EXISTS (SELECT 1 FROM daily_rollup
+                          WHERE daily_rollup.user_id = weigh_in.user_id AND daily_rollup.date = weigh_in.date_logged)
+    """)
+    op.execute("""
+        UPDATE daily_rollup SET bmr_kcal = (
+            SELECT bmr_kcal FROM weigh_in
+            WHERE weigh_in.user_id = daily_rollup.user_id AND weigh_in.date_logged = daily_rollup.date
+            ORDER BY weigh_in.id DESC LIMIT 1)
+    """)
@@ -0,0 +1,31 @@
+"""Add (date DESC, id DESC) indexes for the recent lists and history
+
+Revision ID: 404015b7016a
+Revises: 4eb5fdf97c9e
+Create Date: 2026-10-17 10:21:36.902458
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '404015b7016a'
+down_revision = '4eb5fdf97c9e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_food_entry_date_eaten_id', 'food_entry',
+                    [sa.text('date_eaten DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_activity_entry_date_logged_id', 'activity_entry',
+                    [sa.text('date_logged DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_weigh_in_date_logged_id', 'weigh_in',
+                    [sa.text('date_logged DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_weigh_in_date_logged_id', table_name='weigh_in')
+    op.drop_index('ix_activity_entry_date_logged_id', table_name='activity_entry')
+    op.drop_index('ix_food_entry_date_eaten_id', table_name='food_entry')
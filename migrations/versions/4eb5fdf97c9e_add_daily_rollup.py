@@ -0,0 +1,64 @@
+"""Add daily rollup table
+
+Revision ID: 4eb5fdf97c9e
+Revises: 0282a9c62d46
+Create Date: 2026-10-17 09:47:03.114920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4eb5fdf97c9e'
+down_revision = '0282a9c62d46'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_rollup',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('calories_consumed', sa.Integer(), nullable=False),
+    sa.Column('protein_consumed', sa.Float(), nullable=False),
+    sa.Column('carbs_consumed', sa.Float(), nullable=False),
+    sa.Column('fat_consumed', sa.Float(), nullable=False),
+    sa.Column('calories_burned', sa.Integer(), nullable=False),
+    sa.Column('bmr_kcal', sa.Float(), nullable=True),
+    sa.Column('food_entries', sa.Integer(), nullable=False),
+    sa.Column('activity_entries', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('date')
+    )
+
+    # Backfill the rollup from the existing history so /summary keeps working
+    # straight after the upgrade (same result as `flask rollup rebuild`)
+    op.execute("""
+        INSERT INTO daily_rollup (date, calories_consumed, protein_consumed, carbs_consumed,
+                                  fat_consumed, calories_burned, bmr_kcal,
+                                  food_entries, activity_entries)
+        SELECT days.day,
+               COALESCE(food.calories, 0), COALESCE(food.protein, 0),
+               COALESCE(food.carbs, 0), COALESCE(food.fat, 0),
+               COALESCE(activity.burned, 0), weighins.bmr_kcal,
+               COALESCE(food.entries, 0), COALESCE(activity.entries, 0)
+        FROM (SELECT date_eaten AS day FROM food_entry
+              UNION SELECT date_logged FROM activity_entry
+              UNION SELECT date_logged FROM weigh_in) AS days
+        LEFT JOIN (SELECT date_eaten AS day, SUM(calories) AS calories,
+                          SUM(protein) AS protein, SUM(carbs) AS carbs,
+                          SUM(fat) AS fat, COUNT(*) AS entries
+                   FROM food_entry GROUP BY date_eaten) AS food
+               ON food.day = days.day
+        LEFT JOIN (SELECT date_logged AS day, SUM(calories_burned) AS burned,
+                          COUNT(*) AS entries
+                   FROM activity_entry GROUP BY date_logged) AS activity
+               ON activity.day = days.day
+        LEFT JOIN (SELECT date_logged AS day, bmr_kcal,
+                          ROW_NUMBER() OVER (PARTITION BY date_logged ORDER BY id DESC) AS day_rank
+                   FROM weigh_in) AS weighins
+               ON weighins.day = days.day AND weighins.day_rank = 1
+    """)
+
+
+def downgrade():
+    op.drop_table('daily_rollup')
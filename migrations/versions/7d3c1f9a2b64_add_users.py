@@ -0,0 +1,132 @@
+"""Add users and scope every log table and the daily rollup by user_id
+
+Revision ID: 7d3c1f9a2b64
+Revises: 404015b7016a
+Create Date: 2026-10-17 13:05:12.417306
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d3c1f9a2b64'
+down_revision = '404015b7016a'
+branch_labels = None
+depends_on = None
+
+# (table, date column) of every log table that gets a user_id
+LOG_TABLES = (
+    ('food_entry', 'date_eaten'),
+    ('activity_entry', 'date_logged'),
+    ('weigh_in', 'date_logged'),
+)
+
+def rollup_columns():
+    return (
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('calories_consumed', sa.Integer(), nullable=False),
+        sa.Column('protein_consumed', sa.Float(), nullable=False),
+        sa.Column('carbs_consumed', sa.Float(), nullable=False),
+        sa.Column('fat_consumed', sa.Float(), nullable=False),
+        sa.Column('calories_burned', sa.Integer(), nullable=False),
+        sa.Column('bmr_kcal', sa.Float(), nullable=True),
+        sa.Column('food_entries', sa.Integer(), nullable=False),
+        sa.Column('activity_entries', sa.Integer(), nullable=False),
+    )
+
+# Same aggregation as `flask rollup rebuild`, either per user or (for the downgrade) across all users
+ROLLUP_BACKFILL = """
+    INSERT INTO daily_rollup ({user_column}date, calories_consumed, protein_consumed, carbs_consumed,
+                              fat_consumed, calories_burned, bmr_kcal,
+                              food_entries, activity_entries)
+    SELECT {days_user}days.day,
+           COALESCE(food.calories, 0), COALESCE(food.protein, 0),
+           COALESCE(food.carbs, 0), COALESCE(food.fat, 0),
+           COALESCE(activity.burned, 0), weighins.bmr_kcal,
+           COALESCE(food.entries, 0), COALESCE(activity.entries, 0)
+    FROM (SELECT DISTINCT {user}user_id, date_eaten AS day FROM food_entry
+          UNION SELECT {user}user_id, date_logged FROM activity_entry
+          UNION SELECT {user}user_id, date_logged FROM weigh_in) AS days
+    LEFT JOIN (SELECT {user}user_id, date_eaten AS day, SUM(calories) AS calories,
+                      SUM(protein) AS protein, SUM(carbs) AS carbs,
+                      SUM(fat) AS fat, COUNT(*) AS entries
+               FROM food_entry GROUP BY 1, 2) AS food
+           ON food.user_id = days.user_id AND food.day = days.day
+    LEFT JOIN (SELECT {user}user_id, date_logged AS day, SUM(calories_burned) AS burned,
+                      COUNT(*) AS entries
+               FROM activity_entry GROUP BY 1, 2) AS activity
+           ON activity.user_id = days.user_id AND activity.day = days.day
+    LEFT JOIN (SELECT {user}user_id, date_logged AS day, bmr_kcal,
+                      ROW_NUMBER() OVER (PARTITION BY {partition}date_logged ORDER BY id DESC) AS day_rank
+               FROM weigh_in) AS weighins
+           ON weighins.user_id = days.user_id AND weighins.day = days.day AND weighins.day_rank = 1
+"""
+
+
+def upgrade():
+    user_table = op.create_table('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=80), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('username')
+    )
+
+    # Existing single-user history is handed to an 'owner' account (no password until
+    # `flask user set-password owner` is run)
+    connection = op.get_bind()
+    has_history = any(connection.execute(sa.text(f"SELECT 1 FROM {table} LIMIT 1")).first()
+                      for table, _ in LOG_TABLES)
+    owner_id = None
+    if has_history:
+        # The id comes from the database, so PostgreSQL's id sequence stays in step with it
+        owner_id = connection.execute(user_table.insert().values(
+            username='owner', password_hash=None, created_at=datetime.now())).inserted_primary_key[0]
+
+    for table, date_column in LOG_TABLES:
+        # Expression (DESC) indexes can't be carried through SQLite's batch table copy,
+        # so they are dropped before and recreated after it
+        op.drop_index(f'ix_{table}_{date_column}_id', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        if owner_id is not None:
+            op.execute(sa.text(f"UPDATE {table} SET user_id = :owner_id").bindparams(owner_id=owner_id))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=False)
+            batch_op.create_foreign_key(f'fk_{table}_user_id_user', 'user', ['user_id'], ['id'])
+        op.create_index(f'ix_{table}_user_id_{date_column}_id', table,
+                        ['user_id', sa.text(f'{date_column} DESC'), sa.text('id DESC')], unique=False)
+
+    # The rollup is derived data: recreate it keyed on (user_id, date) and backfill it
+    op.drop_table('daily_rollup')
+    op.create_table('daily_rollup',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    *rollup_columns(),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'date')
+    )
+    op.execute(ROLLUP_BACKFILL.format(user_column='user_id, ', days_user='days.user_id, ', user='', partition='user_id, '))
+
+
+def downgrade():
+    # Collapse the per-user rollup back into one row per day across all users
+    op.drop_table('daily_rollup')
+    op.create_table('daily_rollup',
+    *rollup_columns(),
+    sa.PrimaryKeyConstraint('date')
+    )
+    op.execute(ROLLUP_BACKFILL.format(user_column='', days_user='', user='0 AS ', partition=''))
+
+    for table, date_column in LOG_TABLES:
+        op.drop_index(f'ix_{table}_user_id_{date_column}_id', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'fk_{table}_user_id_user', type_='foreignkey')
+            batch_op.drop_column('user_id')
+        op.create_index(f'ix_{table}_{date_column}_id', table,
+                        [sa.text(f'{date_column} DESC'), sa.text('id DESC')], unique=False)
+
+    op.drop_table('user')
@@ -0,0 +1,37 @@
+"""Judge summary snapshots by a per-user log version stored with the logs
+
+Revision ID: 9b2e6f4c8d31
+Revises: 0c9e4d7a5f18
+Create Date: 2026-10-18 23:52:14.207631
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b2e6f4c8d31'
+down_revision = '0c9e4d7a5f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('log_version', sa.Integer(), nullable=False, server_default='0'))
+
+    # Snapshots are derived data: dropping them makes the next sweep (or /summary) recompute them
+    op.execute("DELETE FROM summary_snapshot")
+    with op.batch_alter_table('summary_snapshot', schema=None) as batch_op:
+        batch_op.drop_column('data_version')
+        batch_op.add_column(sa.Column('log_version', sa.Integer(), nullable=False))
+
+
+def downgrade():
+    op.execute("DELETE FROM summary_snapshot")
+    with op.batch_alter_table('summary_snapshot', schema=None) as batch_op:
+        batch_op.drop_column('log_version')
+        batch_op.add_column(sa.Column('data_version', sa.String(length=64), nullable=False))
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('log_version')
@@ -0,0 +1,57 @@
+"""Add food item owners, admins and the food dictionary version
+
+Revision ID: f5c1b8e3a27d
+Revises: e2a7c9d41b85
+Create Date: 2026-10-18 22:06:27.125470
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c1b8e3a27d'
+down_revision = 'e2a7c9d41b85'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    food_dictionary_version = op.create_table('food_dictionary_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(food_dictionary_version, [{'id': 1, 'version': 1}])
+
+    # Items added before accounts have no owner: only admins may edit them
+    with op.batch_alter_table('food_item', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_by_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_food_item_created_by_id_user', 'user', ['created_by_id'], ['id'])
+
+    with op.batch_alter_table('food_recompute_job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('requested_by_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_food_recompute_job_requested_by_id_user', 'user', ['requested_by_id'], ['id'])
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('is_admin', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    # The first account (the migrated 'owner', or whoever registered first) becomes the admin
+    user = sa.table('user', sa.column('id', sa.Integer()), sa.column('is_admin', sa.Boolean()))
+    op.execute(user.update().where(user.c.id == sa.select(sa.func.min(user.c.id)).scalar_subquery())
+               .values(is_admin=True))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('is_admin')
+
+    with op.batch_alter_table('food_recompute_job', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_food_recompute_job_requested_by_id_user', type_='foreignkey')
+        batch_op.drop_column('requested_by_id')
+
+    with op.batch_alter_table('food_item', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_food_item_created_by_id_user', type_='foreignkey')
+        batch_op.drop_column('created_by_id')
+
+    op.drop_table('food_dictionary_version')
@@ -0,0 +1,279 @@
+# response_cache.py - Versioned HTTP Response Cache
+# /summary, /history and the recent-entry lists only change when something is written, so their
+# rendered responses are cached under (user, route, query args, data version). Every write handler
+# bumps the data version of the user it wrote for (or the global version for shared data such as
+# the food dictionary), which makes all of their older entries unreachable at once. Responses carry
+# an ETag derived from the same key, so a browser revalidating an unchanged page gets a 304 without
+# the cache even being read.
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import date
+from functools import wraps
+
+from flask import make_response, request
+from werkzeug.http import http_date
+
+# Everything needed to rebuild a response without running the view again
+CachedResponse = namedtuple('CachedResponse', ['body', 'status', 'headers', 'created'])
+
+# Headers that belong to one particular response and are never replayed from the cache
+UNCACHED_HEADERS = {'set-cookie', 'server-timing', 'etag', 'last-modified', 'date'}
+
+# --- BACKENDS ---
+# A backend stores CachedResponses by key and owns the data versions (one per scope, where ''
+# is the global scope), so every process that shares a backend (file or Redis) also shares
+# invalidations.
+class MemoryCacheBackend:
+    """Per-process LRU of up to max_entries responses (the default backend)."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        # Versions count up from the process start time, so a version recorded by an earlier
+        # process (e.g. in a client's ETag) is never mistaken for a current one
+        self._first_version = time.time_ns()
+        self._lock = threading.Lock()
+
+    def version(self, scope=''):
+        return self._versions.get(scope, self._first_version)
+
+    def bump_version(self, scope=''):
+        with self._lock:
+            version = self._versions[scope] = self._versions.get(scope, self._first_version) + 1
+            # A global bump makes everything unreachable; a scoped one leaves the stale
+            # entries to age out of the LRU
+            if not scope:
+                self._entries.clear()
+            return version
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            # Evict the least recently used response once the LRU is full
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+class FileCacheBackend:
+    """
+    One pickle file per response in a directory shared by all worker processes, named
+    '<scope hash>-<key hash>.pickle' so a bump can delete just its scope's files. Each data
+    version is a nanosecond timestamp in a 'version-<scope hash>' file, so concurrent bumps
+    from different processes can never produce the same version twice.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _digest(text, size):
+        return hashlib.blake2b(text.encode(), digest_size=size).hexdigest()
+
+    def _version_path(self, scope):
+        return os.path.join(self.directory, f'version-{self._digest(scope, 8)}')
+
+    def _path(self, key):
+        scope = key.split(':', 1)[0]
+        return os.path.join(self.directory, f'{self._digest(scope, 8)}-{self._digest(key, 16)}.pickle')
+
+    def _write(self, path, data):
+        # Write to a temp file and rename it, so readers never see a half-written file
+        handle, temp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(handle, 'wb') as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, path)
+
+    def version(self, scope=''):
+        try:
+            with open(self._version_path(scope), 'rb') as version_file:
+                return int(version_file.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def bump_version(self, scope=''):
+        version = max(self.version(scope) + 1, time.time_ns())
+        self._write(self._version_path(scope), str(version).encode())
+        # Entries of older versions can never be read again
+        prefix = '' if not scope else self._digest(scope, 8) + '-'
+        for name in os.listdir(self.directory):
+            if name.endswith('.pickle') and name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+        return version
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as entry_file:
+                return pickle.load(entry_file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key, entry):
+        self._write(self._path(key), pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+
+class RedisCacheBackend:
+    """
+    Stores responses in Redis (or anything with the same get/set/incr methods, such as a
+    local stand-in for development). Entries expire after `ttl` seconds so versions that
+    are no longer reachable don't pile up.
+    """
+
+    def __init__(self, client, prefix='diet_tracker:response:', ttl=3600):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    @classmethod
+    def from_url(cls, url, **options):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The redis package is required for a redis:// RESPONSE_CACHE_URL.") from None
+        return cls(redis.Redis.from_url(url), **options)
+
+    def version(self, scope=''):
+        return int(self.client.get(f'{self.prefix}version:{scope}') or 0)
+
+    def bump_version(self, scope=''):
+        return self.client.incr(f'{self.prefix}version:{scope}')
+
+    def get(self, key):
+        data = self.client.get(self.prefix + key)
+        return pickle.loads(data) if data is not None else None
+
+    def set(self, key, entry):
+        self.client.set(self.prefix + key, pickle.dumps(entry, pickle.HIGHEST_PROTOCOL), ex=self.ttl)
+
+def create_cache_backend(url=None, max_entries=256):
+    """
+    Builds a backend from a RESPONSE_CACHE_URL: empty or 'memory' for the in-process LRU,
+    'file:///path/to/dir' for the shared file cache, 'redis://host:port/db' for Redis.
+    """
+    if not url or url == 'memory':
+        return MemoryCacheBackend(max_entries)
+    if url.startswith('file://'):
+        return FileCacheBackend(url[len('file://'):])
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisCacheBackend.from_url(url)
+    raise ValueError(f"Unsupported RESPONSE_CACHE_URL '{url}'.")
+
+# --- FLASK INTEGRATION ---
+class ResponseCache:
+    """
+    Caches GET responses of decorated views in a backend.
+
+    The cache key is the scope (scope() returns the current user's id), the endpoint, its
+    sorted query args and today's date (pages default their forms to today), and every
+    entry is stored under the current global and scope data versions. Write handlers call
+    bump_version(user_id) after committing, so that user's next GET re-renders; a bare
+    bump_version() invalidates everyone. Streamed responses, anything but a 200 and
+    responses marked Cache-Control: no-store are never cached.
+    """
+
+    def __init__(self, backend=None, enabled=True, scope=None):
+        self.backend = backend or MemoryCacheBackend()
+        self.enabled = enabled
+        self.scope = scope
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def init_app(self, app):
+        """Uses the backend and switch from RESPONSE_CACHE_URL, RESPONSE_CACHE_SIZE and RESPONSE_CACHE_ENABLED."""
+        self.backend = create_cache_backend(app.config.get('RESPONSE_CACHE_URL'), app.config.get('RESPONSE_CACHE_SIZE', 256))
+        self.enabled = app.config.get('RESPONSE_CACHE_ENABLED', True)
+
+    def bump_version(self, scope=None):
+        """Invalidates the cached responses of one scope (or all of them) after the data changed."""
+        return self.backend.bump_version('' if scope is None else str(scope))
+
+    def data_version(self, scope=None):
+        """
+        The 'global.scoped' data version a scope's entries are stored under. It changes on
+        every bump that affects the scope, so other caches of derived data can key on it too.
+        """
+        scope = '' if scope is None else str(scope)
+        return f'{self.backend.version()}.{self.backend.version(scope) if scope else 0}'
+
+    def cached(self, unless=None):
+        """
+        Decorator for a view. GET/HEAD requests are served from the cache; `unless` is an
+        optional callable that returns True for requests that must always run the view.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or request.method not in ('GET', 'HEAD') or (unless and unless()):
+                    return view(*args, **kwargs)
+
+                scope = str(self.scope() or '') if self.scope else ''
+                key = self._key(scope)
+                etag = hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+
+                # 1. Unchanged since the client's copy: answer without touching the cache
+                if etag in request.if_none_match:
+                    self.not_modified += 1
+                    response = make_response('', 304)
+                    response.set_etag(etag)
+                    response.headers['Cache-Control'] = 'no-cache'
+                    response.vary.add('Cookie')
+                    return response
+
+                # 2. Replay a stored response, or render and store it
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    response = make_response(entry.body, entry.status, entry.headers)
+                else:
+                    self.misses += 1
+                    response = make_response(view(*args, **kwargs))
+                    # A view can keep a response out of the cache with Cache-Control: no-store
+                    if response.status_code != 200 or response.is_streamed or response.cache_control.no_store:
+                        return response
+                    entry = CachedResponse(response.get_data(), response.status_code,
+                                           [(name, value) for name, value in response.headers
+                                            if name.lower() not in UNCACHED_HEADERS],
+                                           time.time())
+                    self.backend.set(key, entry)
+
+                # 3. Validators let the browser revalidate with If-None-Match / If-Modified-Since
+                response.set_etag(etag)
+                response.headers['Last-Modified'] = http_date(entry.created)
+                response.headers['Cache-Control'] = 'no-cache'
+                response.vary.add('Cookie')
+                return response.make_conditional(request)
+            return wrapper
+        return decorator
+
+    def _key(self, scope):
+        version = self.data_version(scope)
+        args = '&'.join(f'{name}={value}' for name, value in sorted(request.args.items(multi=True)))
+        return f'{scope}:{version}:{date.today().isoformat()}:{request.endpoint}?{args}'
+
+    def stats(self):
+        return {
+            'version': self.backend.version(),
+            'hits': self.hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+        }
@@ -0,0 +1,132 @@
+# scheduler.py - Debounced Background Refresh Scheduler
+# Recomputes derived per-user data (the summary snapshots) off the request path. A write calls
+# request(key); the key is refreshed `debounce` seconds after its last request, so a burst of
+# writes costs one refresh, but never later than `max_delay` seconds after the first one. Every
+# `interval` seconds the app's due_keys() is also asked which keys are due anyway (e.g. because
+# their result is older than a day), which is what keeps idle users' results fresh.
+#
+# Refreshes run one at a time in a single daemon thread per process, or in the foreground of a
+# dedicated worker process (run_forever, behind `flask snapshots run`).
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class RefreshScheduler:
+    """
+    Debounced per-key refreshes: refresh(key) runs in an app context for every key that was
+    requested or reported by due_keys(). Nothing starts until init_app() enabled it and the
+    first key is requested (or run_forever() is called).
+    """
+
+    def __init__(self, debounce=2.0, max_delay=30.0, interval=0):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.interval = interval
+        self.enabled = False
+        self.app = None
+        self._refresh = None
+        self._due_keys = None
+
+        self._pending = {}   # key -> (first requested at, due at), in time.monotonic() seconds
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+        self.runs = 0
+        self.failures = 0
+
+    def init_app(self, app, refresh, due_keys=None, debounce=2.0, max_delay=30.0, interval=0, enabled=True):
+        """Binds the scheduler to an app and its refresh(key) / due_keys() callables."""
+        self.app = app
+        self._refresh = refresh
+        self._due_keys = due_keys
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.interval = interval
+        self.enabled = enabled
+
+    def request(self, key):
+        """Schedules a refresh of `key` (debounced); starts the background thread on first use."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._condition:
+            first, _ = self._pending.get(key, (now, None))
+            self._pending[key] = (first, min(now + self.debounce, first + self.max_delay))
+            self._condition.notify()
+        self.start()
+
+    def start(self):
+        """Starts the background thread if it isn't running yet."""
+        with self._condition:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self.run_forever, name='refresh-scheduler', daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=None):
+        """Asks the loop to exit after the refresh in progress; pending keys are dropped."""
+        with self._condition:
+            self._stopping = True
+            self._pending.clear()
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def pending(self):
+        with self._condition:
+            return len(self._pending)
+
+    def run_pending(self, force=False):
+        """Refreshes the keys that are due now (all pending ones with force=True). Returns how many ran."""
+        now = time.monotonic()
+        with self._condition:
+            keys = [key for key, (_, due) in self._pending.items() if force or due <= now]
+            for key in keys:
+                del self._pending[key]
+        for key in keys:
+            self._run(key)
+        return len(keys)
+
+    def run_forever(self):
+        """The scheduler loop: debounced keys as they come due, plus due_keys() every `interval` seconds."""
+        next_sweep = time.monotonic() + self.interval if self.interval else None
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                now = time.monotonic()
+                wake_at = min([due for _, due in self._pending.values()] + ([next_sweep] if next_sweep else []),
+                              default=None)
+                if wake_at is None or wake_at > now:
+                    self._condition.wait(None if wake_at is None else wake_at - now)
+                    continue
+
+            self.run_pending()
+            if next_sweep and time.monotonic() >= next_sweep:
+                self.sweep()
+                next_sweep = time.monotonic() + self.interval
+
+    def sweep(self):
+        """Refreshes every key due_keys() reports. Returns how many ran."""
+        if self._due_keys is None:
+            return 0
+        with self.app.app_context():
+            keys = list(self._due_keys())
+        for key in keys:
+            self._run(key)
+        return len(keys)
+
+    def _run(self, key):
+        # Each refresh gets its own app context (and so its own database session)
+        try:
+            with self.app.app_context():
+                self._refresh(key)
+            self.runs += 1
+        except Exception:
+            self.failures += 1
+            logger.exception("Refreshing %r failed", key)
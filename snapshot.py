@@ -0,0 +1,191 @@
+# snapshot.py - Columnar Snapshots
+# Writes the log tables as one NumPy .npy file per column (plus a manifest.json) and loads them
+# back memory-mapped, so analysis over the whole history reads straight from the page cache: no
+# SQLite, no ORM objects and no copy of the data. Rows are stored sorted by (user_id, date, id),
+# which makes the user_id and date columns the index: a user's rows, or a date range of them, are
+# one contiguous slice found with a binary search.
+#
+#   <directory>/manifest.json
+#   <directory>/<table>/<column>.npy          int64, float64 (NULL = NaN), datetime64[D] or int32 codes
+#   <directory>/<table>/<column>.values.json  vocabulary of a text column (codes index into it)
+#   <directory>/<table>/<group>.npy           float64 (rows, columns) block of related float columns
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+SNAPSHOT_FORMAT = 1
+MANIFEST_NAME = 'manifest.json'
+WRITE_CHUNK_SIZE = 10_000
+
+# Column kind -> dtype of its .npy file
+KIND_DTYPES = {
+    'int': np.dtype(np.int64),
+    'float': np.dtype(np.float64),
+    'date': np.dtype('datetime64[D]'),
+    'text': np.dtype(np.int32),
+}
+
+# --- WRITING ---
+def write_snapshot_table(directory, name, columns, date_column, row_count, rows, groups=None):
+    """
+    Writes one table of `row_count` rows. `columns` is a sequence of (column, kind) pairs and
+    `rows` yields tuples in that order, already sorted by (user_id, date_column, id). `groups`
+    maps a group name to float columns stored side by side as one (rows, n) matrix instead of
+    separately. Returns the table's manifest entry.
+    """
+    groups = groups or {}
+    grouped = {column: (group, position) for group, members in groups.items()
+               for position, column in enumerate(members)}
+    table_dir = os.path.join(directory, name)
+    os.makedirs(table_dir, exist_ok=True)
+
+    # Every file is preallocated with its final shape and filled chunk by chunk through a memmap
+    arrays = {}
+    for column, kind in columns:
+        if column not in grouped:
+            arrays[column] = np.lib.format.open_memmap(os.path.join(table_dir, f'{column}.npy'), mode='w+',
+                                                       dtype=KIND_DTYPES[kind], shape=(row_count,))
+    for group, members in groups.items():
+        arrays[group] = np.lib.format.open_memmap(os.path.join(table_dir, f'{group}.npy'), mode='w+',
+                                                  dtype=KIND_DTYPES['float'], shape=(row_count, len(members)))
+    vocabularies = {column: {} for column, kind in columns if kind == 'text'}
+
+    written = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == WRITE_CHUNK_SIZE:
+            _write_chunk(arrays, columns, grouped, vocabularies, chunk, written)
+            written += len(chunk)
+            chunk = []
+    if chunk:
+        _write_chunk(arrays, columns, grouped, vocabularies, chunk, written)
+        written += len(chunk)
+    if written != row_count:
+        raise ValueError(f"{name}: expected {row_count} rows, got {written}.")
+
+    for array in arrays.values():
+        array.flush()
+    for column, vocabulary in vocabularies.items():
+        with open(os.path.join(table_dir, f'{column}.values.json'), 'w') as values_file:
+            json.dump(list(vocabulary), values_file)
+
+    return {'rows': row_count, 'date_column': date_column, 'columns': dict(columns),
+            'groups': {group: list(members) for group, members in groups.items()}}
+
+def _write_chunk(arrays, columns, grouped, vocabularies, chunk, offset):
+    end = offset + len(chunk)
+    for index, (column, kind) in enumerate(columns):
+        values = [row[index] for row in chunk]
+        if kind == 'text':
+            vocabulary = vocabularies[column]
+            # Missing and empty text share one code (that of ''); codes follow first appearance
+            values = [vocabulary.setdefault(value or '', len(vocabulary)) for value in values]
+        array = np.array(values, dtype=KIND_DTYPES[kind])
+        if column in grouped:
+            group, position = grouped[column]
+            arrays[group][offset:end, position] = array
+        else:
+            arrays[column][offset:end] = array
+
+def write_snapshot_manifest(directory, tables, **info):
+    """Writes manifest.json last, so a snapshot without one is known to be incomplete."""
+    manifest = dict(info, format=SNAPSHOT_FORMAT, created=datetime.now().isoformat(timespec='seconds'),
+                    tables=tables)
+    with open(os.path.join(directory, MANIFEST_NAME), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
+
+# --- LOADING ---
+class SnapshotTable:
+    """
+    Memory-mapped view of one table, or of a contiguous slice of its rows. column(), group()
+    and the slicing methods return views into the mapped files, never copies.
+    """
+
+    def __init__(self, directory, name, spec, start=0, stop=None, _maps=None):
+        self.directory = directory
+        self.name = name
+        self.spec = spec
+        self.date_column = spec['date_column']
+        self.start = start
+        self.stop = spec['rows'] if stop is None else stop
+        # Files are mapped once and shared by every slice of the table
+        self._maps = {} if _maps is None else _maps
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def _map(self, file_name):
+        if file_name not in self._maps:
+            self._maps[file_name] = np.load(os.path.join(self.directory, self.name, f'{file_name}.npy'), mmap_mode='r')
+        return self._maps[file_name]
+
+    def column(self, column):
+        """The column's values for this slice (a strided view if the column is part of a group)."""
+        for group, members in self.spec['groups'].items():
+            if column in members:
+                return self.group(group)[:, members.index(column)]
+        return self._map(column)[self.start:self.stop]
+
+    def group(self, group):
+        """The (rows, n) float matrix of a column group for this slice."""
+        return self._map(group)[self.start:self.stop]
+
+    def text(self, column):
+        """Decodes a text column into a list of strings (this one does copy)."""
+        with open(os.path.join(self.directory, self.name, f'{column}.values.json')) as values_file:
+            vocabulary = json.load(values_file)
+        return [vocabulary[code] for code in self.column(column)]
+
+    def days(self):
+        """The date column as int64 day numbers (days since 1970-01-01), as a view."""
+        return self.column(self.date_column).view(np.int64)
+
+    def _slice(self, start, stop):
+        return SnapshotTable(self.directory, self.name, self.spec, self.start + start, self.start + stop, self._maps)
+
+    def for_user(self, user_id):
+        """The rows of one user: a binary search on the sorted user_id column."""
+        user_ids = self.column('user_id')
+        return self._slice(int(np.searchsorted(user_ids, user_id, side='left')),
+                           int(np.searchsorted(user_ids, user_id, side='right')))
+
+    def between(self, start_date=None, end_date=None):
+        """
+        The rows logged from start_date to end_date (inclusive, either may be None). The dates
+        are only sorted within one user, so call this on a for_user() slice.
+        """
+        dates = self.column(self.date_column)
+        start = 0 if start_date is None else int(np.searchsorted(dates, np.datetime64(start_date, 'D'), side='left'))
+        stop = len(self) if end_date is None else int(np.searchsorted(dates, np.datetime64(end_date, 'D'), side='right'))
+        return self._slice(start, max(start, stop))
+
+class Snapshot:
+    """A loaded snapshot: snapshot['food_entry'] is a SnapshotTable."""
+
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        self.manifest = manifest
+        self.tables = {name: SnapshotTable(directory, name, spec) for name, spec in manifest['tables'].items()}
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    def for_user(self, user_id):
+        """{table name: that user's SnapshotTable slice}."""
+        return {name: table.for_user(user_id) for name, table in self.tables.items()}
+
+def load_snapshot(directory):
+    """Opens a snapshot written by write_snapshot_table/write_snapshot_manifest. Columns are mapped lazily on first use."""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as manifest_file:
+            manifest = json.load(manifest_file)
+    except FileNotFoundError:
+        raise ValueError(f"{directory} has no {MANIFEST_NAME}: not a snapshot, or its export didn't finish.") from None
+    if manifest.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {manifest.get('format')!r} (expected {SNAPSHOT_FORMAT}).")
+    return Snapshot(directory, manifest)
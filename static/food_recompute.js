@@ -0,0 +1,38 @@
+// food_recompute.js - Progress of the entry updates on the Edit Food Item page
+// Polls /manage_food/jobs/<id> for every queued or running job and updates its row until the
+// job is done or failed.
+
+(function () {
+    const POLL_INTERVAL_MS = 1000;
+    const rows = document.querySelectorAll('.recompute-job');
+
+    function isFinished(status) {
+        return status === 'done' || status === 'failed';
+    }
+
+    function poll(row) {
+        fetch(row.dataset.statusUrl, {headers: {'Accept': 'application/json'}})
+            .then(function (response) {
+                return response.ok ? response.json() : Promise.reject(response.status);
+            })
+            .then(function (job) {
+                row.querySelector('.job-status').textContent = job.error ? `${job.status}: ${job.error}` : job.status;
+                row.querySelector('progress').value = job.percent;
+                row.querySelector('.job-count').textContent = `${job.processed_entries} / ${job.total_entries}`;
+                row.querySelector('.job-changed').textContent = job.changed_entries;
+                if (!isFinished(job.status)) {
+                    setTimeout(function () { poll(row); }, POLL_INTERVAL_MS);
+                }
+            })
+            .catch(function () {
+                // Try again later; the job keeps running whether or not this page watches it
+                setTimeout(function () { poll(row); }, POLL_INTERVAL_MS * 5);
+            });
+    }
+
+    rows.forEach(function (row) {
+        if (!isFinished(row.dataset.status)) {
+            poll(row);
+        }
+    });
+})();
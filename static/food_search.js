@@ -0,0 +1,79 @@
+// food_search.js - Food picker autocomplete for the Log Food and Saved Meals forms
+// Queries /api/foods/search as the user types and stores the chosen item's id in the picker's
+// hidden field, so the page never has to ship the whole food dictionary. Every .food-picker on
+// the page (a text input, a hidden input and a results list) gets its own search.
+
+(function () {
+    function describe(item) {
+        return `${item.name} (${item.calories} cal | P:${item.protein} | C:${item.carbs} | F:${item.fat})`;
+    }
+
+    function setUpPicker(picker) {
+        const input = picker.querySelector('input[type="text"]');
+        const hiddenId = picker.querySelector('input[type="hidden"]');
+        const resultsList = picker.querySelector('ul');
+        if (!input || !hiddenId || !resultsList) {
+            return;
+        }
+
+        let debounceTimer = null;
+        let latestRequest = 0;
+
+        function showResults(items) {
+            resultsList.innerHTML = '';
+            items.forEach(function (item) {
+                const option = document.createElement('li');
+                option.textContent = describe(item);
+                option.addEventListener('mousedown', function (event) {
+                    // mousedown fires before the input loses focus
+                    event.preventDefault();
+                    input.value = item.name;
+                    hiddenId.value = item.id;
+                    resultsList.innerHTML = '';
+                });
+                resultsList.appendChild(option);
+            });
+        }
+
+        function search() {
+            const query = input.value.trim();
+            if (!query) {
+                showResults([]);
+                return;
+            }
+
+            // Ignore responses that arrive after a newer search was started
+            const requestNumber = ++latestRequest;
+            fetch(`${input.dataset.searchUrl}?q=${encodeURIComponent(query)}`)
+                .then(function (response) { return response.json(); })
+                .then(function (data) {
+                    if (requestNumber === latestRequest) {
+                        showResults(data.results);
+                    }
+                });
+        }
+
+        input.addEventListener('input', function () {
+            // Typing invalidates the previous choice until a new item is picked
+            hiddenId.value = '';
+            clearTimeout(debounceTimer);
+            debounceTimer = setTimeout(search, 150);
+        });
+
+        input.addEventListener('blur', function () {
+            resultsList.innerHTML = '';
+        });
+
+        input.form.addEventListener('submit', function (event) {
+            // Optional pickers (the extra rows of a meal) may stay empty, but not half-typed
+            if (!hiddenId.value && (input.required || input.value.trim())) {
+                event.preventDefault();
+                input.setCustomValidity('Please pick a food item from the search results.');
+                input.reportValidity();
+                input.setCustomValidity('');
+            }
+        });
+    }
+
+    document.querySelectorAll('.food-picker').forEach(setUpPicker);
+})();
@@ -1,108 +1,376 @@
 # utils.py - Analytical Functions
 
-from datetime import date
+from bisect import bisect_right
+from datetime import date, timedelta
 from itertools import groupby
 
+# NumPy (and analytics.py, which is built on it) is imported inside the columnar and trend
+# functions, so the web app can use the summary helpers without paying for it at startup
+
+# Day numbers in columnar data count from 1970-01-01 (NumPy's datetime64[D] epoch)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
 # --- DAILY SUMMARY CALCULATIONS ---
 
-def calculate_daily_summary(food_entries, activity_entries, weighin_entries):
+def empty_day_totals():
+    """Returns a zeroed totals dict for one day of the daily summary."""
+    return {
+        "calories_consumed": 0,
+        "protein_consumed": 0,
+        "carbs_consumed": 0,
+        "fat_consumed": 0,
+        "calories_burned": 0,
+        "bmr": 0,
+        "total_expenditure": 0, # Placeholder for BMR + Activity
+        "cal_deficit_surplus": 0, # The final calculated value
+    }
+
+def calculate_daily_summary(food_entries, activity_entries, weighin_entries, granularity='day', interpolate=False):
     """
     Calculates the total macros and Calorie Deficit/Surplus for a list of entries,
-    incorporating BMR from the weigh-ins.
+    incorporating BMR from the weigh-ins (see BmrIndex; the list is not modified).
+
+    Entries are grouped in a single pass keyed on their date objects, so the cost is
+    O(entries + days) instead of rescanning every entry once per day. With a granularity
+    of 'week', 'month' or 'year' the days are then grouped into buckets (see summarize_buckets).
     """
+    bmr_index = BmrIndex.from_weighins(weighin_entries, interpolate)
+
+    # --- Step 1 & 2: Aggregate Food and Activity in one pass each ---
     daily_summary = {}
 
-    # Map BMRs to dates (We use the most recent BMR if one isn't logged for a specific day)
-    bmr_lookup = {}
-    if weighin_entries:
-        # Sort weigh-ins oldest first to allow BMR tracking to use the most recent value
-        weighin_entries.sort(key=lambda x: x.date_logged)
-        
-        # Track the last recorded BMR to fill in gaps
-        last_bmr = 0
-        
-        for entry in weighin_entries:
-            last_bmr = entry.bmr_kcal # BMR is BMR kcal/day
-            bmr_lookup[entry.date_logged.strftime('%Y-%m-%d')] = last_bmr
-
-    # --- Step 1 & 2: Aggregate Food and Activity ---
-    
+    def day_totals(day):
+        totals = daily_summary.get(day)
+        if totals is None:
+            totals = daily_summary[day] = empty_day_totals()
+        return totals
+
     # 1. Process Food Entries (Calories Consumed, Macros)
-    all_dates = set(e.date_eaten.strftime('%Y-%m-%d') for e in food_entries)
-    all_dates.update(e.date_logged.strftime('%Y-%m-%d') for e in activity_entries)
-
-    for day_str in all_dates:
-        daily_summary[day_str] = {
-            "calories_consumed": sum(e.calories for e in food_entries if e.date_eaten.strftime('%Y-%m-%d') == day_str),
-            "protein_consumed": sum(e.protein for e in food_entries if e.date_eaten.strftime('%Y-%m-%d') == day_str),
-            "carbs_consumed": sum(e.carbs for e in food_entries if e.date_eaten.strftime('%Y-%m-%d') == day_str),
-            "fat_consumed": sum(e.fat for e in food_entries if e.date_eaten.strftime('%Y-%m-%d') == day_str),
-            "calories_burned": sum(e.calories_burned for e in activity_entries if e.date_logged.strftime('%Y-%m-%d') == day_str),
-            "bmr": bmr_lookup.get(day_str, 0), # Get BMR if available for that day
-            "total_expenditure": 0, # Placeholder for BMR + Activity
-            "cal_deficit_surplus": 0, # The final calculated value
-        }
+    for e in food_entries:
+        totals = day_totals(e.date_eaten)
+        totals["calories_consumed"] += e.calories
+        totals["protein_consumed"] += e.protein
+        totals["carbs_consumed"] += e.carbs
+        totals["fat_consumed"] += e.fat
+
+    # 2. Process Activity Entries (Calories Burned)
+    for e in activity_entries:
+        day_totals(e.date_logged)["calories_burned"] += e.calories_burned
+
+    if granularity == 'day':
+        return build_daily_summary(daily_summary, bmr_index)
+    return bucket_daily_summary(build_daily_summary(daily_summary, bmr_index, format_dates=False), granularity)
 
+def build_daily_summary(daily_summary, bmr_index=None, format_dates=True):
+    """
+    Turns per-day totals keyed on date objects into the newest-first summary list,
+    filling in BMR (each day's bmr_index.as_of(day), 0 without an index), total
+    expenditure and the Calorie Deficit/Surplus. With format_dates=False each day keeps
+    its date object (for summarize_buckets).
+
+    Shared by calculate_daily_summary and the database-side aggregation in app.py,
+    so both paths produce exactly the same structure for summary.html.
+    """
     # --- Step 3: Calculate Final Deficit/Surplus ---
     # Deficit/Surplus = Consumed - (BMR + Activity Burned)
-    for day_data in daily_summary.values():
-        
-        # If BMR wasn't found for the specific log date, try to estimate a close BMR
-        if day_data["bmr"] == 0 and weighin_entries:
-             # Use the BMR from the LATEST weigh-in as a reasonable estimate if the daily BMR is missing
-             day_data["bmr"] = weighin_entries[-1].bmr_kcal 
-        
+    final_list = []
+
+    # Sorting the date objects newest first matches sorting their YYYY-MM-DD strings
+    for day in sorted(daily_summary, reverse=True):
+        day_data = daily_summary[day]
+        # The BMR in effect that day, not the latest one: history keeps its own deficits
+        day_data["bmr"] = bmr_index.as_of(day) if bmr_index else 0
+
         day_data["total_expenditure"] = day_data["bmr"] + day_data["calories_burned"]
-        
+
         # Calculate Deficit/Surplus
         day_data["cal_deficit_surplus"] = day_data["calories_consumed"] - day_data["total_expenditure"]
-        
-    final_list = [dict(date=k, **v) for k, v in daily_summary.items()]
-    final_list.sort(key=lambda x: x['date'], reverse=True)
-    
+
+        # Dates are only formatted once per day, never once per entry
+        day_data["date"] = day.strftime('%Y-%m-%d') if format_dates else day
+        final_list.append(day_data)
+
     return final_list
 
+def calculate_daily_summary_from_columns(food, activity, weighins, interpolate=False):
+    """
+    Same result as calculate_daily_summary, computed from columnar tables (a user's
+    snapshot.SnapshotTable slices, or anything with the same days()/column() methods) whose
+    rows are sorted by date. Per-day totals come from np.unique + np.bincount, so no
+    per-entry Python object is ever built.
+    """
+    import numpy as np
+
+    daily_summary = {}
+
+    def add_day_sums(table, sums):
+        days, day_index = np.unique(table.days(), return_inverse=True)
+        totals = {key: np.bincount(day_index, weights=table.column(column), minlength=len(days))
+                  for key, column in sums.items()}
+        for position, day in enumerate(days.tolist()):
+            day_data = daily_summary.setdefault(date.fromordinal(EPOCH_ORDINAL + day), empty_day_totals())
+            for key, values in totals.items():
+                # Calorie columns are integers in the database, so their totals are too
+                day_data[key] += int(values[position]) if key.startswith("calories") else float(values[position])
+
+    # 1. Food: calories consumed and macros per day
+    if len(food):
+        add_day_sums(food, {"calories_consumed": "calories", "protein_consumed": "protein",
+                            "carbs_consumed": "carbs", "fat_consumed": "fat"})
+
+    # 2. Activity: calories burned per day
+    if len(activity):
+        add_day_sums(activity, {"calories_burned": "calories_burned"})
+
+    # 3. BMR as of each day, indexed straight from the day numbers (already sorted by date)
+    bmr_index = None
+    if len(weighins):
+        bmr_index = BmrIndex((weighins.days() + EPOCH_ORDINAL).tolist(),
+                             weighins.column("bmr_kcal").astype(float).tolist(), interpolate)
+
+    return build_daily_summary(daily_summary, bmr_index)
+
+# --- BMR AS OF DATE ---
+
+class BmrIndex:
+    """
+    The BMR in effect on any day, from a user's weigh-ins: that of the last weigh-in on or
+    before the day (the first weigh-in's for earlier days), or with interpolate=True the
+    straight line between the weigh-ins either side of it.
+
+    Weigh-ins are kept as two parallel lists sorted by day ordinal, so building the index is
+    O(weigh-ins) and every lookup is one bisect, O(log weigh-ins), with no per-day strings.
+    """
+
+    def __init__(self, ordinals, bmrs, interpolate=False):
+        # ordinals must be sorted; of several weigh-ins on one day the last one wins
+        self.interpolate = interpolate
+        self.ordinals = []
+        self.bmrs = []
+        for ordinal, bmr in zip(ordinals, bmrs):
+            if bmr is None:
+                continue
+            if self.ordinals and self.ordinals[-1] == ordinal:
+                self.bmrs[-1] = bmr
+            else:
+                self.ordinals.append(ordinal)
+                self.bmrs.append(bmr)
+
+    @classmethod
+    def from_rows(cls, rows, interpolate=False):
+        """Builds the index from (date, bmr_kcal) rows sorted by date (and id within a day)."""
+        ordinals, bmrs = [], []
+        for day, bmr in rows:
+            ordinals.append(day.toordinal())
+            bmrs.append(bmr)
+        return cls(ordinals, bmrs, interpolate)
+
+    @classmethod
+    def from_weighins(cls, weighin_entries, interpolate=False):
+        """Builds the index from WeighIn objects in any order (sorted into a copy; ties keep their order)."""
+        ordered = sorted(weighin_entries, key=lambda entry: entry.date_logged)
+        return cls.from_rows(((entry.date_logged, entry.bmr_kcal) for entry in ordered), interpolate)
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def as_of(self, day):
+        """The effective BMR on `day` (a date), or 0 if there are no weigh-ins."""
+        if not self.ordinals:
+            return 0
+        ordinal = day.toordinal()
+        position = bisect_right(self.ordinals, ordinal)
+        if position == 0:
+            return self.bmrs[0]
+        if position == len(self.ordinals) or not self.interpolate or self.ordinals[position - 1] == ordinal:
+            return self.bmrs[position - 1]
+
+        # Between two weigh-ins: weight each by how close the day is to it
+        start, end = self.ordinals[position - 1], self.ordinals[position]
+        fraction = (ordinal - start) / (end - start)
+        return self.bmrs[position - 1] + (self.bmrs[position] - self.bmrs[position - 1]) * fraction
+
+# --- TIME-BUCKETED SUMMARIES ---
+SUMMARY_GRANULARITIES = ('day', 'week', 'month', 'year')
+
+# Summed per bucket; every one also gets a per-logged-day average (avg_<key>)
+BUCKET_TOTAL_KEYS = ("calories_consumed", "protein_consumed", "carbs_consumed", "fat_consumed",
+                     "calories_burned", "bmr", "total_expenditure", "cal_deficit_surplus")
+
+def bucket_start(day, granularity):
+    """First day of the week (Monday), month or year that `day` falls in."""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day.replace(month=1, day=1)
+
+def bucket_label(start, granularity):
+    if granularity == 'week':
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == 'month':
+        return start.strftime('%Y-%m')
+    return str(start.year)
+
+def summarize_buckets(entries, granularity):
+    """
+    Groups newest-first daily summary rows, or buckets of a finer granularity, into 'week',
+    'month' or 'year' buckets, newest first. Every bucket keeps the totals and the number of
+    logged days, so coarser buckets are built from finer ones (a year from its 12 months)
+    without going back to the days, and the averages are always per logged day.
+    """
+    buckets = {}
+    for entry in entries:
+        day = entry['start'] if 'start' in entry else entry['date']
+        start = bucket_start(date.fromisoformat(day) if isinstance(day, str) else day, granularity)
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = dict(dict.fromkeys(BUCKET_TOTAL_KEYS, 0), start=start, days=0)
+        bucket['days'] += entry.get('days', 1)
+        for key in BUCKET_TOTAL_KEYS:
+            bucket[key] += entry[key]
+
+    final_list = []
+    for start in sorted(buckets, reverse=True):
+        bucket = buckets[start]
+        bucket['period'] = bucket_label(start, granularity)
+        for key in BUCKET_TOTAL_KEYS:
+            bucket[f'avg_{key}'] = bucket[key] / bucket['days']
+        final_list.append(bucket)
+    return final_list
+
+def bucket_daily_summary(daily_list, granularity):
+    """Buckets a daily summary list: weeks and months from the days, years from the months."""
+    if granularity == 'year':
+        return summarize_buckets(summarize_buckets(daily_list, 'month'), 'year')
+    return summarize_buckets(daily_list, granularity)
+
 # --- METRIC TREND CALCULATIONS ---
 
 def analyze_metric_trends(weighin_entries):
     """
     Analyzes historical WeighIn data to determine overall trends for each BeWell metric.
+
+    The entries are copied into one columnar array and handed to analytics.compute_metric_trends,
+    which adds rolling averages, EMA smoothing, weekly slope and min/max to the first/last change.
+    The caller's list is left untouched.
     """
     if not weighin_entries or len(weighin_entries) < 2:
         return {} 
 
-    weighin_entries.sort(key=lambda x: x.date_logged)
-    
-    latest_entry = weighin_entries[-1]
-    oldest_entry = weighin_entries[0]
-
-    metric_map = {
-        'weight_lbs': {'label': 'Weight', 'unit': 'lbs'},
-        'fat_pct': {'label': 'Body Fat', 'unit': '%'},
-        'bmi': {'label': 'BMI', 'unit': ''},
-        'bmr_kcal': {'label': 'BMR', 'unit': 'kcal/day'},
-        'visceral_fat': {'label': 'Visceral Fat', 'unit': ''},
-        'muscle_lbs': {'label': 'Muscle', 'unit': 'lbs'},
-        'bone_mass_lbs': {'label': 'Bone Mass', 'unit': 'lbs'},
-        'protein_pct': {'label': 'Protein', 'unit': '%'},
-        'water_pct': {'label': 'Water', 'unit': '%'},
-        'skeletal_muscle_lbs': {'label': 'Skeletal Muscle', 'unit': 'lbs'},
+    from analytics import METRIC_COLUMNS, compute_metric_trends, metric_columns_from_rows
+    ordered = sorted(weighin_entries, key=lambda x: x.date_logged)
+    rows = ([entry.date_logged] + [getattr(entry, col) for col in METRIC_COLUMNS] for entry in ordered)
+    return compute_metric_trends(*metric_columns_from_rows(rows))
+
+def analyze_metric_trends_from_columns(weighins):
+    """
+    analyze_metric_trends for a columnar weigh-in table sorted by date (e.g. a user's snapshot
+    slice). The day numbers and the metrics group are handed to the analytics as memory-mapped
+    views, without copying them first.
+    """
+    if len(weighins) < 2:
+        return {}
+    from analytics import compute_metric_trends
+    return compute_metric_trends(weighins.days(), weighins.group('metrics'))
+
+# --- GOAL PROJECTION ---
+# "When will I reach my target weight?" answered two ways from the same recent window: by
+# extending the least-squares line through the weigh-ins, and by converting the average daily
+# net calorie balance into pounds. Each estimate comes with a band from the standard error of
+# its rate (FORECAST_Z = 1.96 for ~95%).
+
+CALORIES_PER_LB = 3500
+FORECAST_WINDOW_DAYS = 90
+FORECAST_MAX_DAYS = 5 * 365   # further out than this counts as "not at this rate"
+FORECAST_Z = 1.96
+
+def fit_line(xs, ys):
+    """
+    Least-squares line through (x, y) points. Returns (slope, intercept, slope standard error),
+    or None with fewer than 3 points or no spread in x.
+    """
+    n = len(xs)
+    if n < 3:
+        return None
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    intercept = mean_y - slope * mean_x
+    residuals = sum((y - intercept - slope * x) ** 2 for x, y in zip(xs, ys))
+    return slope, intercept, (residuals / (n - 2) / sxx) ** 0.5
+
+def project_rate(remaining, rate, stderr, start):
+    """
+    Projects reaching `remaining` pounds (negative = to lose) at `rate` lb/day ± FORECAST_Z
+    standard errors, from `start`. Returns the expected, earliest and latest dates (None where
+    that end of the band never gets there within FORECAST_MAX_DAYS) and the rate per week.
+    """
+    def arrival(daily_rate):
+        # Only a rate heading towards the target arrives
+        if daily_rate * remaining <= 0:
+            return None
+        days = remaining / daily_rate
+        return start + timedelta(days=round(days)) if days <= FORECAST_MAX_DAYS else None
+
+    towards = 1 if remaining > 0 else -1
+    margin = FORECAST_Z * stderr
+    return {
+        'rate_per_week': rate * 7,
+        'date': arrival(rate),
+        'earliest': arrival(rate + towards * margin),
+        'latest': arrival(rate - towards * margin),
     }
-    
-    trend_summary = {}
-
-    for col, info in metric_map.items():
-        latest_value = getattr(latest_entry, col)
-        oldest_value = getattr(oldest_entry, col)
-        change = latest_value - oldest_value
-
-        trend_summary[col] = {
-            'label': info['label'],
-            'unit': info['unit'],
-            'latest_value': latest_value,
-            'oldest_value': oldest_value,
-            'change': change,
-            'trend': 'Gain' if change > 0 else 'Loss' if change < 0 else 'No Change'
-        }
-        
-    return trend_summary
\ No newline at end of file
+
+def project_goal(target_weight, weighins, daily_summary, window_days=FORECAST_WINDOW_DAYS):
+    """
+    Forecasts when `target_weight` (lbs) will be reached.
+
+    `weighins` are (date, weight_lbs) pairs sorted oldest first and `daily_summary` is
+    calculate_daily_summary's list of days (in any order); only the last `window_days`
+    before the latest weigh-in are used. Returns None without a weigh-in, otherwise the
+    current weight, the pounds remaining and a 'trend' and a 'deficit' projection (see
+    project_rate; None when there is too little data for that method).
+    """
+    if not weighins:
+        return None
+    latest_day, current_weight = weighins[-1]
+    window_start = (latest_day - timedelta(days=window_days - 1)).toordinal()
+    remaining = target_weight - current_weight
+    forecast = {
+        'target_weight': target_weight,
+        'current_weight': current_weight,
+        'as_of': latest_day,
+        'remaining': remaining,
+        'reached': abs(remaining) < 0.05,
+        'window_days': window_days,
+        'trend': None,
+        'deficit': None,
+    }
+    if forecast['reached']:
+        return forecast
+
+    # 1. Weight trend: slope of the weigh-ins in the window, in lb/day
+    recent = [(day.toordinal(), weight) for day, weight in weighins if day.toordinal() >= window_start]
+    fit = fit_line([day for day, _ in recent], [weight for _, weight in recent])
+    if fit:
+        slope, _, stderr = fit
+        forecast['trend'] = project_rate(remaining, slope, stderr, latest_day)
+
+    # 2. Energy balance: the mean daily surplus (deficits are negative) turned into lb/day
+    balances = []
+    for day in daily_summary:
+        logged = day['date'] if isinstance(day['date'], date) else date.fromisoformat(day['date'])
+        if window_start <= logged.toordinal() <= latest_day.toordinal():
+            balances.append(day['cal_deficit_surplus'])
+    if len(balances) >= 3:
+        mean = sum(balances) / len(balances)
+        variance = sum((balance - mean) ** 2 for balance in balances) / (len(balances) - 1)
+        stderr = (variance / len(balances)) ** 0.5
+        forecast['deficit'] = project_rate(remaining, mean / CALORIES_PER_LB, stderr / CALORIES_PER_LB, latest_day)
+
+    return forecast
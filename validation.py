@@ -0,0 +1,255 @@
+# validation.py - Input Validation Rules
+# Shared by the HTML form handlers in app.py and the bulk importer, so a row from a CSV/JSON
+# file is accepted or rejected exactly like the same values typed into the form.
+
+import math
+from datetime import datetime, date, timedelta
+
+class ValidationError(ValueError):
+    """Raised when submitted values break one of the logging rules. str(error) is user-facing."""
+
+# The 10 BeWell metric columns of a WeighIn, in form order
+WEIGHIN_METRIC_FIELDS = (
+    'weight_lbs', 'fat_pct', 'bmi', 'bmr_kcal', 'visceral_fat',
+    'muscle_lbs', 'bone_mass_lbs', 'protein_pct', 'water_pct', 'skeletal_muscle_lbs',
+)
+
+# Keeps calories x multiplier a finite number that int() can store
+SERVING_MULTIPLIER_MAX = 1000
+
+# SQLite stores integers as signed 64 bits; a larger Python int can't even be bound
+SQLITE_INT_MIN, SQLITE_INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+# Calories of one activity (or one serving of a food): keeps the daily rollup's sums in range
+ENTRY_CALORIES_MAX = 1_000_000
+
+# The length of FoodItem.name
+FOOD_NAME_MAX_LENGTH = 100
+
+# --- HELPER FUNCTIONS: VALUE PARSING ---
+# JSON rows (imports, the batch API) can carry any JSON type, and float() accepts 'nan' and
+# 'inf', so every value is checked to be something the database stores as it was given.
+
+def parse_date_input(date_str):
+    """Converts a YYYY-MM-DD string from an HTML date input to a Python date object."""
+    if date_str:
+        if not isinstance(date_str, str):
+            raise TypeError(f"Dates must be strings, not {type(date_str).__name__}.")
+        # Fast path for the exact layout date inputs send (bulk imports parse millions of these)
+        if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+            try:
+                return date.fromisoformat(date_str)
+            except ValueError:
+                pass
+        return datetime.strptime(date_str, '%Y-%m-%d').date()
+    return date.today()
+
+def parse_float(value):
+    """float(value), rejecting nan and inf (SQLite would store nan as NULL)."""
+    try:
+        number = float(value)
+    except OverflowError:
+        raise ValueError(f"{value!r} is too large.")
+    if not math.isfinite(number):
+        raise ValueError(f"{value!r} is not a finite number.")
+    return number
+
+def parse_int(value):
+    """int(value), rejecting numbers outside SQLite's 64-bit integer range."""
+    try:
+        number = int(value)
+    except OverflowError:
+        raise ValueError(f"{value!r} is not a finite number.")
+    if not SQLITE_INT_MIN <= number <= SQLITE_INT_MAX:
+        raise ValueError(f"{value!r} is too large.")
+    return number
+
+def parse_text(value, label):
+    """A free-text field: a string, or None when it's missing."""
+    if value is not None and not isinstance(value, str):
+        raise ValidationError(f"{label} must be text.")
+    return value
+
+# --- ENTRY VALIDATION ---
+# Each parser takes any mapping with .get() (request.form, a csv.DictReader row, a JSON object)
+# and returns a dict keyed by model column names, or raises ValidationError.
+
+def parse_food_item(data):
+    """Validates a food dictionary item (new or edited). Returns its name and per-serving macros."""
+    name = (data.get('name') or '').strip()
+    if not name:
+        raise ValidationError("Food name is required.")
+    if len(name) > FOOD_NAME_MAX_LENGTH:
+        raise ValidationError(f"Food names can be at most {FOOD_NAME_MAX_LENGTH} characters.")
+
+    try:
+        values = {
+            'name': name,
+            'calories': parse_int(data.get('calories') or 0),
+            'protein': parse_float(data.get('protein') or 0),
+            'carbs': parse_float(data.get('carbs') or 0),
+            'fat': parse_float(data.get('fat') or 0),
+        }
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid numeric input for macros.")
+
+    # An edit is copied into every entry and meal logged from the item, so bad macros never get in
+    if any(values[key] < 0 for key in ('calories', 'protein', 'carbs', 'fat')):
+        raise ValidationError("Calories and macros can't be negative.")
+    if values['calories'] > ENTRY_CALORIES_MAX:
+        raise ValidationError(f"A serving can have at most {ENTRY_CALORIES_MAX:,} calories.")
+    return values
+
+def parse_food_entry(data):
+    """Validates a food log submission. Returns food_item_id, serving_multiplier, notes and date_eaten."""
+    try:
+        # Get the serving multiplier
+        serving_multiplier = parse_float(data.get('serving_multiplier') or 1.0)
+        log_date = parse_date_input(data.get('date_eaten'))
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid numeric input for serving size.")
+
+    if not valid_serving_multiplier(serving_multiplier):
+        raise ValidationError(f"Serving size must be greater than zero and at most {SERVING_MULTIPLIER_MAX}.")
+
+    # An id that isn't a number can never match a dictionary item
+    food_item_id = data.get('food_item_id')
+    try:
+        food_item_id = parse_int(food_item_id) if food_item_id not in (None, '') else None
+    except (TypeError, ValueError):
+        food_item_id = None
+
+    return {
+        'food_item_id': food_item_id,
+        'serving_multiplier': serving_multiplier,
+        'notes': parse_text(data.get('notes'), "Notes"),
+        'date_eaten': log_date,
+    }
+
+def valid_serving_multiplier(value):
+    """True for a finite multiplier above zero and no larger than SERVING_MULTIPLIER_MAX (rejects nan/inf)."""
+    return math.isfinite(value) and 0 < value <= SERVING_MULTIPLIER_MAX
+
+def food_entry_macros(source_item, serving_multiplier):
+    """Calculates a FoodEntry's final calories and macros from its dictionary item and multiplier."""
+    return {
+        'calories': int(source_item.calories * serving_multiplier),
+        'protein': source_item.protein * serving_multiplier,
+        'carbs': source_item.carbs * serving_multiplier,
+        'fat': source_item.fat * serving_multiplier,
+    }
+
+def parse_activity_entry(data):
+    """Validates an activity log submission. Returns the ActivityEntry column values."""
+    activity_type = parse_text(data.get('activity_type'), "Activity type")
+
+    try:
+        # Safely cast numeric inputs, defaulting to 0 if empty
+        duration = parse_float(data.get('duration_minutes') or 0)
+        calories = parse_int(data.get('calories_burned') or 0)
+        # Distance is optional
+        distance = parse_float(data.get('distance_miles') or 0)
+        log_date = parse_date_input(data.get('date_logged'))
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid numeric input for duration, calories, or distance.")
+
+    # Essential Validation: Must have type, duration, and calories burned
+    if not activity_type or duration <= 0 or calories <= 0:
+        raise ValidationError("Activity type, duration, and calories burned are required.")
+    if calories > ENTRY_CALORIES_MAX:
+        raise ValidationError(f"Calories burned can be at most {ENTRY_CALORIES_MAX:,}.")
+
+    return {
+        'activity_type': activity_type,
+        'duration_minutes': duration,
+        'calories_burned': calories,
+        'distance_miles': distance,
+        'notes': parse_text(data.get('notes'), "Notes"),
+        'date_logged': log_date,
+    }
+
+def parse_weighin(data):
+    """Validates a weigh-in submission. Returns the date and all 10 BeWell metric values."""
+    try:
+        values = {'date_logged': parse_date_input(data.get('date_logged'))}
+
+        # Use float casting with error handling for all 10 BeWell metrics
+        for field in WEIGHIN_METRIC_FIELDS:
+            values[field] = parse_float(data.get(field) or 0)
+    except (TypeError, ValueError):
+        raise ValidationError("All metrics must be valid numbers.")
+
+    # Basic Validation: Ensure weight is logged
+    if values['weight_lbs'] <= 0:
+        raise ValidationError("Weight must be entered to log metrics.")
+
+    return values
+
+# --- MEAL VALIDATION ---
+MEAL_MAX_ITEMS = 20
+MEAL_REPEAT_MAX_DAYS = 366
+
+def parse_meal(data, max_items=MEAL_MAX_ITEMS):
+    """
+    Validates a saved meal: its name plus food_item_id_<n> / serving_multiplier_<n> rows
+    (n = 0, 1, ...; rows without an item are skipped). Returns the name and a list of
+    (food_item_id, serving_multiplier) pairs in row order.
+    """
+    name = (data.get('name') or '').strip()
+    if not name:
+        raise ValidationError("Meal name is required.")
+
+    items = []
+    for row in range(max_items):
+        food_item_id = data.get(f'food_item_id_{row}')
+        if food_item_id in (None, ''):
+            continue
+        try:
+            items.append((parse_int(food_item_id), parse_float(data.get(f'serving_multiplier_{row}') or 1.0)))
+        except (TypeError, ValueError):
+            raise ValidationError(f"Invalid food item or serving size in row {row + 1}.")
+        if not valid_serving_multiplier(items[-1][1]):
+            raise ValidationError(f"The serving size in row {row + 1} must be greater than zero "
+                                  f"and at most {SERVING_MULTIPLIER_MAX}.")
+
+    if not items:
+        raise ValidationError("A meal needs at least one food item.")
+    return {'name': name, 'items': items}
+
+def parse_meal_log(data, max_days=MEAL_REPEAT_MAX_DAYS):
+    """
+    Validates logging a saved meal: meal_id, date_eaten and an optional repeat_until date (the
+    meal is logged on every day from one to the other). Returns meal_id, the dates and notes.
+    """
+    try:
+        meal_id = parse_int(data.get('meal_id'))
+        first_day = parse_date_input(data.get('date_eaten'))
+        last_day = parse_date_input(data.get('repeat_until')) if data.get('repeat_until') else first_day
+    except (TypeError, ValueError):
+        raise ValidationError("Please pick a meal and valid dates.")
+
+    if last_day < first_day:
+        raise ValidationError("'Repeat until' can't be before the first day.")
+    day_count = (last_day - first_day).days + 1
+    if day_count > max_days:
+        raise ValidationError(f"A meal can be repeated for at most {max_days} days at once.")
+
+    return {
+        'meal_id': meal_id,
+        'dates': [first_day + timedelta(days=offset) for offset in range(day_count)],
+        'notes': parse_text(data.get('notes'), "Notes"),
+    }
+
+# --- GOAL VALIDATION ---
+
+def parse_goal(data):
+    """Validates a weight goal: target_weight_lbs and an optional target_date. Returns both."""
+    try:
+        target_weight = parse_float(data.get('target_weight_lbs') or 0)
+        target_date = parse_date_input(data.get('target_date')) if data.get('target_date') else None
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid target weight or date.")
+
+    if target_weight <= 0:
+        raise ValidationError("Target weight must be greater than zero.")
+    return {'target_weight_lbs': target_weight, 'target_date': target_date}